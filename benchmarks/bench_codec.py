@@ -0,0 +1,73 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark the JSON codecs on payloads shaped like job results.
+
+Run with ``python benchmarks/bench_codec.py``.
+"""
+
+import random
+import timeit
+
+from ansys.conceptev.core import codec
+
+
+def job_results(curves: int = 20, points: int = 5000) -> list[dict]:
+    """Make a list of results shaped like the output of ``/jobs:result``."""
+    rng = random.Random(0)
+    return [
+        {
+            "requirement_id": f"requirement_{index}",
+            "capability_curve": {
+                "speeds": [rng.uniform(0, 60) for _ in range(points)],
+                "torques": [rng.uniform(0, 500) for _ in range(points)],
+            },
+            "units": {"speeds": "m/s", "torques": "N.m"},
+            "feasible": True,
+        }
+        for index in range(curves)
+    ]
+
+
+def main(number: int = 5):
+    """Print the encode and decode times of each available codec."""
+    data = job_results()
+    content = codec.get_codec("json").dumps(data)
+    print(f"Payload size: {len(content) / 1e6:.1f} MB")
+    baseline = None
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            current = codec.get_codec(name)
+        except Exception:
+            print(f"{name:>8}: not installed")
+            continue
+        encode = min(timeit.repeat(lambda: current.dumps(data), number=number)) / number
+        decode = min(timeit.repeat(lambda: current.loads(content), number=number)) / number
+        baseline = baseline or (encode, decode)
+        print(
+            f"{name:>8}: encode {encode * 1e3:7.1f} ms ({baseline[0] / encode:4.1f}x), "
+            f"decode {decode * 1e3:7.1f} ms ({baseline[1] / decode:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
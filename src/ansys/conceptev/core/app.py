@@ -22,15 +22,19 @@
 
 """Simple API client for the Ansys ConceptEV service."""
 
+import contextlib
+import contextvars
 import datetime
-from json import JSONDecodeError
 import os
-import time
-from typing import Literal
+from typing import Callable, Literal, Sequence
 
 import dotenv
 import httpx
 
+from ansys.conceptev.core import cancellation, codec
+from ansys.conceptev.core.compression import CompressionTransport, TransferStats, accept_encoding
+from ansys.conceptev.core.hashing import canonical_hash
+
 dotenv.load_dotenv()
 
 Router = Literal[
@@ -38,6 +42,7 @@ Router = Literal[
     "/components",
     "/components:from_file",
     "/components:calculate_loss_map",
+    "/components:get_display_data",
     "/configurations",
     "/configurations:calculate_forces",
     "/requirements",
@@ -53,6 +58,9 @@ Router = Literal[
     "/utilities:data_format_version",
 ]
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+OCM_TIMEOUT = httpx.Timeout(5.0)
+
 
 def get_token() -> str:
     """Get token from OCM."""
@@ -67,17 +75,121 @@ def get_token() -> str:
     return response.json()["accessToken"]
 
 
-def get_http_client(token: str, design_instance_id: str | None = None) -> httpx.Client:
+class ConceptEVClient(httpx.Client):
+    """HTTP client whose design instance can be changed for a block of code.
+
+    Inside ``with client.design_instance(id):``, requests from the current thread or task use
+    that design instance instead of the default one. Other threads and tasks are not affected,
+    so one client and its connection pool can serve many design instances at the same time.
+
+    Requests made in a :func:`cancellation.scope` raise if its token has been cancelled, and
+    their timeouts are capped at the time left until its deadline. If the token is cancelled
+    while a request is in flight, the request raises straight away. The request is not
+    aborted. It finishes in the background and its response is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create the client."""
+        super().__init__(*args, **kwargs)
+        self._design_instance_id = contextvars.ContextVar("design_instance_id", default=None)
+
+    @contextlib.contextmanager
+    def design_instance(self, design_instance_id: str):
+        """Use a design instance for requests in the current thread or task."""
+        token = self._design_instance_id.set(design_instance_id)
+        try:
+            yield self
+        finally:
+            self._design_instance_id.reset(token)
+
+    def build_request(self, method, url, *, params=None, **kwargs) -> httpx.Request:
+        """Build a request, adding the design instance and deadline of the current scope."""
+        token = cancellation.current()
+        if token is not None:
+            token.check()
+            timeout = kwargs.get("timeout", httpx.USE_CLIENT_DEFAULT)
+            if timeout is httpx.USE_CLIENT_DEFAULT:
+                timeout = self.timeout
+            kwargs["timeout"] = token.timeout(httpx.Timeout(timeout))
+        design_instance_id = self._design_instance_id.get()
+        if design_instance_id is not None:
+            params = httpx.QueryParams(params).set("design_instance_id", design_instance_id)
+        return super().build_request(method, url, params=params, **kwargs)
+
+    def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        """Send a request, and stop waiting if the token of the current scope is cancelled."""
+        return cancellation.run_in_thread(
+            super().send, request, abandon=lambda response: response.close(), **kwargs
+        )
+
+
+def get_design_instance_id(client: httpx.Client) -> str | None:
+    """Get the design instance that requests from a client currently use."""
+    if isinstance(client, ConceptEVClient):
+        design_instance_id = client._design_instance_id.get()
+        if design_instance_id is not None:
+            return design_instance_id
+    return client.params.get("design_instance_id")
+
+
+def get_http_client(
+    token: str,
+    design_instance_id: str | None = None,
+    accept_encodings: Sequence[str] | None = None,
+    request_encoding: str | None = None,
+    stats: TransferStats | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> ConceptEVClient:
     """Get an HTTP client.
 
     The HTTP client creates and maintains the connection, which is more performant than
-    re-creating this connection for each call.
+    re-creating this connection for each call. Use ``client.design_instance(id)`` to work
+    with other design instances over the same connection pool.
+
+    ``accept_encodings`` sets the response encodings to ask for, in order of preference, such
+    as ``("zstd", "br", "gzip")``. Encodings that cannot be decoded here are left out. If
+    ``request_encoding`` is set, large request bodies are compressed with it. If ``stats`` is
+    given, the bytes sent and received for each route are recorded in it. ``transport`` replaces
+    the default HTTP transport, for example to record or replay a session.
     """
     base_url = os.environ["CONCEPTEV_URL"]
     params = None
     if design_instance_id:
         params = {"design_instance_id": design_instance_id}
-    return httpx.Client(headers={"Authorization": token}, params=params, base_url=base_url)
+    headers = {"Authorization": token}
+    if accept_encodings is not None:
+        headers["Accept-Encoding"] = accept_encoding(accept_encodings)
+    return ConceptEVClient(
+        headers=headers,
+        params=params,
+        base_url=base_url,
+        transport=(
+            CompressionTransport(request_encoding, transport=transport)
+            if request_encoding
+            else transport
+        ),
+        event_hooks=stats.event_hooks(base_url) if stats else None,
+    )
+
+
+def get_ocm_client(transport: httpx.BaseTransport | None = None) -> ConceptEVClient:
+    """Get an HTTP client for OCM.
+
+    Like the ConceptEV client, its requests check the token of the current
+    :func:`cancellation.scope` and stop waiting when it is cancelled. ``transport`` replaces
+    the default HTTP transport, for example to record or replay a session.
+    """
+    return ConceptEVClient(base_url=os.environ["OCM_URL"], transport=transport)
+
+
+@contextlib.contextmanager
+def _ocm_client(ocm_client: httpx.Client | None):
+    """Use an OCM client, or a new one that is closed afterwards."""
+    if ocm_client is not None:
+        yield ocm_client
+        return
+    with get_ocm_client() as client:
+        yield client
 
 
 def process_response(response) -> dict:
@@ -87,8 +199,8 @@ def process_response(response) -> dict:
     """
     if response.status_code == 200 or response.status_code == 201:  # Success
         try:
-            return response.json()
-        except JSONDecodeError:
+            return codec.loads(response.content)
+        except codec.decode_errors():
             return response.content
     raise Exception(f"Response Failed:{response.content}")
 
@@ -113,10 +225,47 @@ def post(client: httpx.Client, router: Router, data: dict, params: dict = {}) ->
 
     This HTTP verb performs the ``POST`` request and adds the route to the base client.
     """
-    response = client.post(url=router, json=data, params=params)
+    response = client.post(
+        url=router, content=codec.dumps(data), headers=JSON_HEADERS, params=params
+    )
     return process_response(response)
 
 
+_ensure_indexes = {}
+
+
+def ensure(client: httpx.Client, router: Router, data: dict, index: dict | None = None) -> dict:
+    """Get an entity with the given content, creating it only if it does not exist.
+
+    The payload is canonicalized and hashed. The hash is looked up in ``index``, which maps
+    payload hashes to IDs and defaults to an index kept for each base URL, design instance
+    and route. If the hash is not in the index, the route is listed and any entity whose
+    values match every key of the payload is used. A ``POST`` request is only sent if no
+    entity matches.
+    """
+    if index is None:
+        design_instance_id = get_design_instance_id(client)
+        index = _ensure_indexes.setdefault((str(client.base_url), design_instance_id, router), {})
+    key = canonical_hash(data)
+    if key in index:
+        response = client.get(url="/".join([router, index[key]]))
+        if response.status_code != 404:
+            entity = process_response(response)
+            if canonical_hash({name: entity.get(name) for name in data}) == key:
+                return entity
+        del index[key]
+
+    for entity in get(client, router):
+        entity_key = canonical_hash({name: entity.get(name) for name in data})
+        index.setdefault(entity_key, entity["id"])
+        if entity_key == key:
+            return entity
+
+    created = post(client, router, data=data)
+    index[key] = created["id"]
+    return created
+
+
 def delete(client: httpx.Client, router: Router, id: str) -> dict:
     """Send a DELETE request to the base client.
 
@@ -134,7 +283,7 @@ def put(client: httpx.Client, router: Router, id: str, data: dict) -> dict:
     An HTTP verb that performs the ``PUT`` request and adds the route to the base client.
     """
     path = "/".join([router, id])
-    response = client.put(url=path, json=data)
+    response = client.put(url=path, content=codec.dumps(data), headers=JSON_HEADERS)
     return process_response(response)
 
 
@@ -144,9 +293,30 @@ def create_new_project(
     hpc_id: str,
     title: str,
     project_goal: str = "Created from the CLI",
+    cancel_token: cancellation.CancelToken | None = None,
+    ocm_client: httpx.Client | None = None,
+):
+    """Create a project.
+
+    If the operation is cancelled, the progress of the error holds the project and design that
+    have already been created. OCM requests are sent with ``ocm_client``, which defaults to a
+    new client from :func:`get_ocm_client`.
+    """
+    progress = {}
+    with cancellation.scope(cancel_token, progress), _ocm_client(ocm_client) as ocm:
+        return _create_new_project(client, ocm, account_id, hpc_id, title, project_goal, progress)
+
+
+def _create_new_project(
+    client: httpx.Client,
+    ocm: httpx.Client,
+    account_id: str,
+    hpc_id: str,
+    title: str,
+    project_goal: str,
+    progress: dict,
 ):
-    """Create a project."""
-    osm_url = os.environ["OCM_URL"]
+    """Create a project, recording each step in ``progress``."""
     token = client.headers["Authorization"]
     project_data = {
         "accountId": account_id,
@@ -154,13 +324,23 @@ def create_new_project(
         "projectTitle": title,
         "projectGoal": project_goal,
     }
-    created_project = httpx.post(
-        osm_url + "/project/create", headers={"Authorization": token}, json=project_data
+    cancellation.check(progress)
+    created_project = ocm.post(
+        "/project/create",
+        headers={"Authorization": token},
+        json=project_data,
+        timeout=cancellation.timeout(OCM_TIMEOUT),
     )
     if created_project.status_code != 200 and created_project.status_code != 204:
         raise Exception(f"Failed to create a project {created_project}.")
+    progress["project"] = created_project.json()
 
-    product_ids = httpx.get(osm_url + "/product/list", headers={"Authorization": token})
+    cancellation.check(progress)
+    product_ids = ocm.get(
+        "/product/list",
+        headers={"Authorization": token},
+        timeout=cancellation.timeout(OCM_TIMEOUT),
+    )
     product_id = [
         product["productId"]
         for product in product_ids.json()
@@ -172,14 +352,24 @@ def create_new_project(
         "productId": product_id,
         "designTitle": "Branch 1",
     }
-    created_design = httpx.post(
-        osm_url + "/design/create", headers={"Authorization": token}, json=design_data
+    cancellation.check(progress)
+    created_design = ocm.post(
+        "/design/create",
+        headers={"Authorization": token},
+        json=design_data,
+        timeout=cancellation.timeout(OCM_TIMEOUT),
     )
 
     if created_design.status_code not in (200, 204):
         raise Exception(f"Failed to create a design on OCM {created_design.content}.")
+    progress["design"] = created_design.json()
 
-    user_details = httpx.post(osm_url + "/user/details", headers={"Authorization": token})
+    cancellation.check(progress)
+    user_details = ocm.post(
+        "/user/details",
+        headers={"Authorization": token},
+        timeout=cancellation.timeout(OCM_TIMEOUT),
+    )
     if user_details.status_code not in (200, 204):
         raise Exception(f"Failed to get a user details on OCM {user_details}.")
 
@@ -207,10 +397,14 @@ def get_concept_ids(client: httpx.Client):
     return {concept["name"]: concept["id"] for concept in concepts}
 
 
-def get_account_ids(token: str) -> dict:
+def get_account_ids(
+    token: str,
+    ocm_client: httpx.Client | None = None,
+    cancel_token: cancellation.CancelToken | None = None,
+) -> dict:
     """Get account IDs."""
-    ocm_url = os.environ["OCM_URL"]
-    response = httpx.post(url=ocm_url + "/account/list", headers={"authorization": token})
+    with cancellation.scope(cancel_token), _ocm_client(ocm_client) as ocm:
+        response = ocm.post(url="/account/list", headers={"authorization": token})
     if response.status_code != 200:
         raise Exception(f"Failed to get accounts {response}.")
     accounts = {
@@ -220,14 +414,19 @@ def get_account_ids(token: str) -> dict:
     return accounts
 
 
-def get_default_hpc(token: str, account_id: str):
+def get_default_hpc(
+    token: str,
+    account_id: str,
+    ocm_client: httpx.Client | None = None,
+    cancel_token: cancellation.CancelToken | None = None,
+):
     """Get the default HPC ID."""
-    ocm_url = os.environ["OCM_URL"]
-    response = httpx.post(
-        url=ocm_url + "/account/hpc/default",
-        json={"accountId": account_id},
-        headers={"authorization": token},
-    )
+    with cancellation.scope(cancel_token), _ocm_client(ocm_client) as ocm:
+        response = ocm.post(
+            url="/account/hpc/default",
+            json={"accountId": account_id},
+            headers={"authorization": token},
+        )
     if response.status_code != 200:
         raise Exception(f"Failed to get accounts {response}.")
     return response.json()["hpcId"]
@@ -239,8 +438,16 @@ def create_submit_job(
     account_id: str,
     hpc_id: str,
     job_name: str = "cli_job: " + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
+    cancel_token: cancellation.CancelToken | None = None,
+    on_created: Callable[[dict], None] | None = None,
 ):
-    """Create and then submit a job."""
+    """Create and then submit a job.
+
+    If the operation is cancelled after the job was created, the progress of the error holds
+    the job. ``on_created`` is called with the body of the ``/jobs:start`` request after the
+    job is created and before it is started.
+    """
+    progress = {}
     job_input = {
         "job_name": job_name,
         "requirement_ids": concept["requirements_ids"],
@@ -248,14 +455,18 @@ def create_submit_job(
         "concept_id": concept["id"],
         "design_instance_id": concept["design_instance_id"],
     }
-    job, uploaded_file = post(client, "/jobs", data=job_input)
-    job_start = {
-        "job": job,
-        "uploaded_file": uploaded_file,
-        "account_id": account_id,
-        "hpc_id": hpc_id,
-    }
-    job_info = post(client, "/jobs:start", data=job_start)
+    with cancellation.scope(cancel_token, progress):
+        job, uploaded_file = post(client, "/jobs", data=job_input)
+        progress["job"] = job
+        job_start = {
+            "job": job,
+            "uploaded_file": uploaded_file,
+            "account_id": account_id,
+            "hpc_id": hpc_id,
+        }
+        if on_created is not None:
+            on_created(job_start)
+        job_info = post(client, "/jobs:start", data=job_start)
     return job_info
 
 
@@ -266,33 +477,58 @@ def read_file(filename: str) -> str:
     return content
 
 
+def read_results_content(
+    client,
+    job_info: dict,
+    calculate_units: bool = True,
+    no_of_tries: int = 200,
+    rate_limit: float = 0.3,
+    cancel_token: cancellation.CancelToken | None = None,
+) -> bytes:
+    """Read the undecoded content of job results.
+
+    Continuously request job results until a valid response is received or a limit of tries is
+    reached. If the operation is cancelled, the progress of the error holds the number of
+    tries made.
+    """
+    progress = {"tries": 0}
+    with cancellation.scope(cancel_token, progress):
+        version_number = get(client, "/utilities:data_format_version")
+        for _ in range(0, no_of_tries):
+            response = client.post(
+                url="/jobs:result",
+                content=codec.dumps(job_info),
+                headers=JSON_HEADERS,
+                params={
+                    "results_file_name": f"output_file_v{version_number}.json",
+                    "calculate_units": calculate_units,
+                },
+            )
+            progress["tries"] += 1
+            cancellation.sleep(rate_limit, progress)
+            if response.status_code == 200:
+                return response.content
+
+    raise Exception(f"There are too many requests: {response}.")
+
+
 def read_results(
     client,
     job_info: dict,
     calculate_units: bool = True,
     no_of_tries: int = 200,
     rate_limit: float = 0.3,
+    cancel_token: cancellation.CancelToken | None = None,
 ) -> dict:
     """Read job results.
 
     Continuously request job results until a valid response is received or a limit of tries is
     reached.
     """
-    version_number = get(client, "/utilities:data_format_version")
-    for _ in range(0, no_of_tries):
-        response = client.post(
-            url="/jobs:result",
-            json=job_info,
-            params={
-                "results_file_name": f"output_file_v{version_number}.json",
-                "calculate_units": calculate_units,
-            },
-        )
-        time.sleep(rate_limit)
-        if response.status_code == 200:
-            return response.json()
-
-    raise Exception(f"There are too many requests: {response}.")
+    content = read_results_content(
+        client, job_info, calculate_units, no_of_tries, rate_limit, cancel_token
+    )
+    return codec.loads(content)
 
 
 def post_component_file(client: httpx.Client, filename: str, component_file_type: str) -> dict:
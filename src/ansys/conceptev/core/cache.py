@@ -0,0 +1,130 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Caches for API results."""
+
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+from ansys.conceptev.core import codec
+
+_missing = object()
+
+
+class LRUCache:
+    """Thread-safe cache that holds at most ``maxsize`` items and drops the least recently used."""
+
+    def __init__(self, maxsize: int = 1024):
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get an item, or ``default`` if it is not in the cache."""
+        with self._lock:
+            value = self._items.get(key, _missing)
+            if value is _missing:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Add or replace an item."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Remove all items."""
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key) -> bool:
+        """Check whether an item is in the cache."""
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        """Get the number of items in the cache."""
+        with self._lock:
+            return len(self._items)
+
+
+class DiskCache:
+    """Cache of JSON values in a SQLite file, which is kept between processes.
+
+    Keys are strings and values are anything that the codec can encode.
+    """
+
+    def __init__(self, path: str):
+        """Open or create a cache file."""
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, stored_at REAL)"
+            )
+
+    def get(self, key: str, default=None):
+        """Get an item, or ``default`` if it is not in the cache."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return codec.loads(row[0]) if row else default
+
+    def set(self, key: str, value):
+        """Add or replace an item."""
+        content = codec.dumps(value)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, content, time.time())
+            )
+
+    def clear(self):
+        """Remove all items."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache")
+
+    def close(self):
+        """Close the cache file."""
+        self._db.close()
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether an item is in the cache."""
+        with self._lock:
+            return (
+                self._db.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is not None
+            )
+
+    def __len__(self) -> int:
+        """Get the number of items in the cache."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
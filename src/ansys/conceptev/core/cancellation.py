@@ -0,0 +1,298 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Deadlines and cooperative cancellation of API calls."""
+
+import asyncio
+from concurrent.futures import Future
+import contextlib
+import contextvars
+import threading
+import time
+import weakref
+
+import httpx
+
+_current = contextvars.ContextVar("cancel_token", default=None)
+
+
+class Cancelled(Exception):
+    """Error raised when an operation is cancelled.
+
+    ``progress`` holds what the operation had done before it stopped, such as the IDs of the
+    entities it had created, so that the caller can resume or clean up.
+    """
+
+    def __init__(self, message: str, progress: dict | None = None):
+        """Create the error."""
+        super().__init__(message)
+        self.progress = progress
+
+
+class DeadlineExceeded(Cancelled):
+    """Error raised when an operation runs past its deadline."""
+
+
+class CancelToken:
+    """Token that cancels operations when it is cancelled or its deadline passes.
+
+    ``timeout`` is the number of seconds until the deadline. A token with a ``parent`` is also
+    cancelled when its parent is, and its deadline is never later than its parent's. Tokens can
+    be cancelled from any thread, and sleeps in :meth:`sleep` and :meth:`asleep` wake up
+    straight away. A parent only keeps a weak reference to its children.
+    """
+
+    def __init__(self, timeout: float | None = None, parent: "CancelToken | None" = None):
+        """Create a token."""
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        if parent is not None and parent.deadline is not None:
+            self.deadline = min(parent.deadline, self.deadline or parent.deadline)
+        self.reason = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters = []
+        if parent is not None:
+            child = weakref.ref(self, lambda _: parent.remove_callback(cancel_child))
+
+            def cancel_child(reason):
+                token = child()
+                if token is not None:
+                    token.cancel(reason)
+
+            parent.add_callback(cancel_child)
+
+    def add_callback(self, callback):
+        """Call a function with the reason when the token is cancelled.
+
+        If the token has already been cancelled, the function is called straight away.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._waiters.append(callback)
+                return
+        callback(self.reason)
+
+    def remove_callback(self, callback):
+        """Stop calling a function when the token is cancelled."""
+        with self._lock:
+            if callback in self._waiters:
+                self._waiters.remove(callback)
+
+    def cancel(self, reason: str = "The operation was cancelled."):
+        """Cancel the token and any child tokens."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            waiters, self._waiters = self._waiters, []
+        for callback in waiters:
+            callback(reason)
+
+    def remaining(self) -> float | None:
+        """Get the number of seconds until the deadline, or ``None`` if there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def cancelled(self) -> bool:
+        """Check whether the token has been cancelled or its deadline has passed."""
+        return self._event.is_set() or self.remaining() == 0
+
+    def check(self, progress: dict | None = None):
+        """Raise :class:`Cancelled` or :class:`DeadlineExceeded` if operations must stop."""
+        if self._event.is_set():
+            raise Cancelled(self.reason, progress)
+        if self.remaining() == 0:
+            raise DeadlineExceeded("The deadline was exceeded.", progress)
+
+    def sleep(self, seconds: float, progress: dict | None = None):
+        """Sleep, waking up and raising straight away if the token is cancelled."""
+        remaining = self.remaining()
+        self._event.wait(seconds if remaining is None else min(seconds, remaining))
+        self.check(progress)
+
+    async def asleep(self, seconds: float, progress: dict | None = None):
+        """Sleep in a coroutine, waking up and raising straight away if the token is cancelled."""
+        await self.run(asyncio.sleep(seconds), progress)
+
+    async def run(self, awaitable, progress: dict | None = None):
+        """Await something, cancelling it if the token is cancelled before it finishes."""
+        self.check(progress)
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(awaitable)
+        cancelled = loop.create_future()
+
+        def wake(reason):
+            loop.call_soon_threadsafe(lambda: cancelled.done() or cancelled.set_result(reason))
+
+        self.add_callback(wake)
+        try:
+            await asyncio.wait(
+                (task, cancelled), timeout=self.remaining(), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            self.remove_callback(wake)
+            cancelled.cancel()
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            self.check(progress)
+            raise DeadlineExceeded("The deadline was exceeded.", progress)
+        return task.result()
+
+    def result(self, future: Future, progress: dict | None = None):
+        """Wait for the result of a future, raising straight away if the token is cancelled."""
+        woken = threading.Event()
+
+        def wake(_):
+            woken.set()
+
+        future.add_done_callback(wake)
+        self.add_callback(wake)
+        try:
+            woken.wait(self.remaining())
+        finally:
+            self.remove_callback(wake)
+        if not future.done():
+            self.check(progress)
+            raise DeadlineExceeded("The deadline was exceeded.", progress)
+        return future.result()
+
+    def timeout(self, timeout: httpx.Timeout) -> httpx.Timeout:
+        """Cap the parts of a request timeout at the time left until the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+
+        def cap(seconds):
+            return remaining if seconds is None else min(seconds, remaining)
+
+        return httpx.Timeout(
+            connect=cap(timeout.connect),
+            read=cap(timeout.read),
+            write=cap(timeout.write),
+            pool=cap(timeout.pool),
+        )
+
+
+def current() -> CancelToken | None:
+    """Get the token of the current scope."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def scope(token: CancelToken | None = None, progress: dict | None = None):
+    """Use a token for the API calls in the current thread or task.
+
+    Without a token, the token of the enclosing scope is kept. Cancellations raised in the
+    scope, including requests that time out because the deadline is near, carry
+    ``progress``, which the operation can fill in as it goes.
+    """
+    token = token or _current.get()
+    reset = _current.set(token)
+    try:
+        yield token
+    except Cancelled as error:
+        if error.progress is None:
+            error.progress = progress
+        raise
+    except httpx.TimeoutException:
+        if token is not None:
+            token.check(progress)
+        raise
+    finally:
+        _current.reset(reset)
+
+
+def check(progress: dict | None = None):
+    """Raise if the token of the current scope has been cancelled."""
+    token = _current.get()
+    if token is not None:
+        token.check(progress)
+
+
+def sleep(seconds: float, progress: dict | None = None):
+    """Sleep, waking up early if the token of the current scope is cancelled."""
+    token = _current.get()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.sleep(seconds, progress)
+
+
+def timeout(timeout: httpx.Timeout) -> httpx.Timeout:
+    """Cap a request timeout at the time left until the deadline of the current scope."""
+    token = _current.get()
+    return timeout if token is None else token.timeout(timeout)
+
+
+@contextlib.contextmanager
+def detached():
+    """Run code without the token of the enclosing scope.
+
+    This is for work that is shared by several callers, which must not be cancelled by one of
+    them.
+    """
+    reset = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(reset)
+
+
+def result(future: Future, progress: dict | None = None):
+    """Wait for the result of a future, raising if the token of the current scope is cancelled."""
+    token = _current.get()
+    return future.result() if token is None else token.result(future, progress)
+
+
+def run_in_thread(fn, *args, abandon=None, **kwargs):
+    """Run a blocking call, and stop waiting for it if the token of the current scope is cancelled.
+
+    With a token, the call runs in a new thread. When the token is cancelled the call keeps
+    running, and ``abandon`` is called with its result if it returns. Without a token, the
+    call runs in the current thread.
+    """
+    token = _current.get()
+    if token is None:
+        return fn(*args, **kwargs)
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), daemon=True).start()
+    try:
+        return token.result(future)
+    except Cancelled:
+        if abandon is not None:
+            future.add_done_callback(
+                lambda done: done.exception() is None and abandon(done.result())
+            )
+        raise
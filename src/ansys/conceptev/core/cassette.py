@@ -0,0 +1,190 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Recording and replaying of HTTP sessions for offline testing and profiling."""
+
+import base64
+from collections import defaultdict, deque
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Sequence
+
+import httpx
+
+from ansys.conceptev.core.hashing import canonical_json
+
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+VOLATILE_FIELDS = ("job_name",)
+MULTIPART_BOUNDARY = b"cassette-boundary"
+
+
+def _without_fields(data, fields: Sequence[str]):
+    """Remove some keys from JSON data at any depth."""
+    if isinstance(data, dict):
+        return {
+            key: _without_fields(value, fields) for key, value in data.items() if key not in fields
+        }
+    if isinstance(data, list):
+        return [_without_fields(value, fields) for value in data]
+    return data
+
+
+def _normalized_content(request: httpx.Request, content: bytes, volatile_fields) -> bytes:
+    """Get the body of a request without the parts that change between runs.
+
+    Multipart boundaries, which are random, are replaced by a fixed one, and
+    ``volatile_fields``, such as the default job name that holds the time, are removed from
+    JSON bodies.
+    """
+    content_type = request.headers.get("Content-Type", "")
+    if content_type.startswith("multipart/") and "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].split(";")[0].strip('"').encode()
+        return content.replace(boundary, MULTIPART_BOUNDARY)
+    if volatile_fields and content_type.startswith("application/json"):
+        try:
+            return canonical_json(_without_fields(json.loads(content), volatile_fields))
+        except ValueError:
+            return content
+    return content
+
+
+def _request_key(
+    request: httpx.Request, content: bytes, volatile_fields: Sequence[str]
+) -> tuple[str, str, str]:
+    """Get the key that a request is matched on."""
+    normalized = _normalized_content(request, content, volatile_fields)
+    return request.method, str(request.url), hashlib.sha256(normalized).hexdigest()
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Transport that writes each request and response to a cassette file.
+
+    The cassette is a gzip-compressed file with one JSON record per line holding the request
+    method, URL and body hash, and the response status, headers, decoded body and elapsed
+    time. Request headers, which hold the token, are not recorded. The body is hashed without
+    its multipart boundary or ``volatile_fields``, so that it matches the same request in
+    another run.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transport: httpx.BaseTransport | None = None,
+        volatile_fields: Sequence[str] = VOLATILE_FIELDS,
+    ):
+        """Record the requests sent through a transport, which is a new HTTP one by default."""
+        self.transport = transport or httpx.HTTPTransport()
+        self.volatile_fields = volatile_fields
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record it with its response."""
+        content = request.read()
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        body = response.read()
+        elapsed = time.perf_counter() - start
+        response.close()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in DROPPED_HEADERS
+        ]
+        try:
+            encoded_body = {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            encoded_body = {"base64": base64.b64encode(body).decode("ascii")}
+        method, url, body_hash = _request_key(request, content, self.volatile_fields)
+        record = {
+            "method": method,
+            "url": url,
+            "request_hash": body_hash,
+            "status_code": response.status_code,
+            "headers": headers,
+            "elapsed": elapsed,
+            **encoded_body,
+        }
+        with self._lock:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return httpx.Response(status_code=response.status_code, headers=headers, content=body)
+
+    def close(self):
+        """Close the cassette and the wrapped transport."""
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+def read_cassette(path: str) -> list[dict]:
+    """Read the records in a cassette file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Transport that answers requests with the responses recorded in a cassette.
+
+    Requests are matched on method, URL and body, normalized in the same way as when they were
+    recorded. Identical requests get their recorded responses in the order that they were
+    recorded, and the last one is repeated. With ``realtime`` set, each response is delayed by
+    its recorded time multiplied by ``time_scale``, so ``0.5`` replays twice as fast. Otherwise
+    responses are returned straight away.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        realtime: bool = False,
+        time_scale: float = 1.0,
+        volatile_fields: Sequence[str] = VOLATILE_FIELDS,
+    ):
+        """Load a cassette."""
+        self.realtime = realtime
+        self.volatile_fields = volatile_fields
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._responses = defaultdict(deque)
+        for record in read_cassette(path):
+            key = (record["method"], record["url"], record["request_hash"])
+            self._responses[key].append(record)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Get the recorded response to a request."""
+        key = _request_key(request, request.read(), self.volatile_fields)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise Exception(f"No recorded response to {request.method} {request.url}.")
+            record = responses.popleft() if len(responses) > 1 else responses[0]
+        if self.realtime:
+            time.sleep(record["elapsed"] * self.time_scale)
+        if "text" in record:
+            body = record["text"].encode("utf-8")
+        else:
+            body = base64.b64decode(record["base64"])
+        return httpx.Response(
+            status_code=record["status_code"], headers=record["headers"], content=body
+        )
@@ -0,0 +1,129 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""JSON encoding and decoding with the fastest available library."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+class JSONCodec:
+    """Encode and decode JSON with the standard library."""
+
+    name = "json"
+    decode_errors: tuple[type[Exception], ...] = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def dumps(self, data) -> bytes:
+        """Encode data as JSON."""
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def loads(self, content: bytes | str):
+        """Decode JSON content."""
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode JSON with orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        """Create the codec."""
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+    def dumps(self, data) -> bytes:
+        """Encode data as JSON."""
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+    def loads(self, content: bytes | str):
+        """Decode JSON content."""
+        return orjson.loads(content)
+
+
+class MsgspecCodec(JSONCodec):
+    """Encode and decode JSON with msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        """Create the codec."""
+        self.decode_errors = (msgspec.DecodeError,)
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, data) -> bytes:
+        """Encode data as JSON."""
+        return self._encoder.encode(data)
+
+    def loads(self, content: bytes | str):
+        """Decode JSON content."""
+        return self._decoder.decode(content)
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Get a JSON codec by name.
+
+    Without a name, orjson is used if it is installed, then msgspec, then the standard library.
+    """
+    if name is None:
+        name = "orjson" if orjson else "msgspec" if msgspec else "json"
+    if name == "orjson" and orjson:
+        return OrjsonCodec()
+    if name == "msgspec" and msgspec:
+        return MsgspecCodec()
+    if name == "json":
+        return JSONCodec()
+    raise Exception(f"JSON codec {name} is not available.")
+
+
+codec = get_codec()
+
+
+def set_codec(name: str | None = None) -> JSONCodec:
+    """Set the JSON codec used for requests and responses."""
+    global codec
+    codec = get_codec(name)
+    return codec
+
+
+def dumps(data) -> bytes:
+    """Encode data as JSON with the current codec."""
+    return codec.dumps(data)
+
+
+def loads(content: bytes | str):
+    """Decode JSON content with the current codec."""
+    return codec.loads(content)
+
+
+def decode_errors() -> tuple[type[Exception], ...]:
+    """Get the errors that the current codec raises for content that is not JSON."""
+    return codec.decode_errors
@@ -0,0 +1,258 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Compression of request and response bodies."""
+
+import gzip
+import threading
+from typing import Sequence
+
+import httpx
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+COMPRESSED_SIZE = "conceptev_compressed_size"
+
+
+def decodable_encodings() -> set[str]:
+    """Get the content encodings that httpx can decode in this environment."""
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:  # pragma: no cover
+        return {"gzip", "deflate"}
+    return set(SUPPORTED_DECODERS) - {"identity"}
+
+
+def accept_encoding(preferred: Sequence[str] = PREFERRED_ENCODINGS) -> str:
+    """Get an ``Accept-Encoding`` header value with the preferred encodings that can be decoded.
+
+    Earlier encodings in ``preferred`` are given higher quality values.
+    """
+    encodings = [encoding for encoding in preferred if encoding in decodable_encodings()]
+    if not encodings:
+        return "identity"
+    step = 1 / (len(encodings) + 1)
+    return ", ".join(
+        encoding if index == 0 else f"{encoding};q={1 - index * step:.2f}"
+        for index, encoding in enumerate(encodings)
+    )
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """Compress content with a content encoding."""
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=6)
+    if encoding == "br" and brotli:
+        return brotli.compress(content, quality=5)
+    if encoding == "zstd" and zstandard:
+        return zstandard.ZstdCompressor().compress(content)
+    raise Exception(f"Cannot compress request bodies with {encoding}.")
+
+
+class CompressionTransport(httpx.BaseTransport):
+    """Transport that compresses large request bodies before sending them.
+
+    Bodies of ``POST``, ``PUT`` and ``PATCH`` requests that are at least ``min_size`` bytes
+    and not already encoded are compressed with ``encoding``. The server must accept
+    compressed request bodies for this to be used.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        min_size: int = 1024,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        """Wrap a transport, which is a new HTTP transport by default."""
+        compress(b"", encoding)
+        self.encoding = encoding
+        self.min_size = min_size
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Compress the request body if it is large enough and send the request."""
+        content = request.read()
+        if (
+            request.method in ("POST", "PUT", "PATCH")
+            and len(content) >= self.min_size
+            and "Content-Encoding" not in request.headers
+        ):
+            compressed = compress(content, self.encoding)
+            headers = httpx.Headers(request.headers)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(compressed))
+            request.extensions[COMPRESSED_SIZE] = len(compressed)
+            request = httpx.Request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=compressed,
+                extensions={
+                    key: value
+                    for key, value in request.extensions.items()
+                    if key != COMPRESSED_SIZE
+                },
+            )
+        return self.transport.handle_request(request)
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+def _content_decoder(content_encoding: str):
+    """Get a decoder for a ``Content-Encoding`` header value, or ``None`` for no encoding."""
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS, MultiDecoder
+    except ImportError:  # pragma: no cover
+        return None
+    encodings = [value.strip().lower() for value in content_encoding.split(",")]
+    decoders = [
+        SUPPORTED_DECODERS[encoding]()
+        for encoding in encodings
+        if encoding != "identity" and encoding in SUPPORTED_DECODERS
+    ]
+    if not decoders:
+        return None
+    return decoders[0] if len(decoders) == 1 else MultiDecoder(children=decoders)
+
+
+class _CountingStream(httpx.SyncByteStream):
+    """Response stream that counts its bytes as they are read and calls back when closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, content_encoding: str, on_close):
+        """Wrap a stream."""
+        self.stream = stream
+        self.on_close = on_close
+        self.size = 0
+        self.uncompressed_size = 0
+        self._decoder = _content_decoder(content_encoding)
+
+    def _decode(self, data: bytes, flush: bool = False):
+        """Count the size of data once decoded."""
+        if self._decoder is None:
+            self.uncompressed_size += len(data)
+            return
+        try:
+            decoded = self._decoder.flush() if flush else self._decoder.decode(data)
+            self.uncompressed_size += len(decoded)
+        except Exception:
+            self._decoder = None
+            self.uncompressed_size = self.size
+
+    def __iter__(self):
+        """Iterate over the wrapped stream."""
+        for chunk in self.stream:
+            self.size += len(chunk)
+            self._decode(chunk)
+            yield chunk
+
+    def close(self):
+        """Close the wrapped stream and call back with the counted sizes."""
+        try:
+            self.stream.close()
+        finally:
+            self._decode(b"", flush=True)
+            self.on_close(self.size, self.uncompressed_size)
+
+
+class TransferStats:
+    """Count the bytes sent and received for each route.
+
+    Add :meth:`event_hooks` to a client. For each route, ``sent`` and ``received`` are the
+    bytes on the wire and ``sent_uncompressed`` and ``received_uncompressed`` are the body
+    sizes before compression. Routes are the first segment of the path, such as ``/concepts``
+    for ``/concepts/<id>``. Response bodies are counted as they are read and recorded when the
+    response is closed, so streamed responses are not read in advance.
+    """
+
+    def __init__(self):
+        """Create empty counters."""
+        self._lock = threading.Lock()
+        self.routes = {}
+
+    @staticmethod
+    def route(path: str, base_path: str = "") -> str:
+        """Get the route of a request path."""
+        if base_path and path.startswith(base_path):
+            path = path[len(base_path) :]
+        return "/" + path.lstrip("/").split("/", 1)[0]
+
+    def record_response(self, response: httpx.Response, base_path: str = ""):
+        """Record the sizes of a request and its response once the response is closed."""
+        if not isinstance(response.stream, httpx.SyncByteStream):
+            return
+        response.stream = _CountingStream(
+            response.stream,
+            response.headers.get("Content-Encoding", ""),
+            lambda size, uncompressed_size: self._record(
+                response.request, base_path, size, uncompressed_size
+            ),
+        )
+
+    def _record(self, request: httpx.Request, base_path: str, received: int, uncompressed: int):
+        """Add the sizes of a request and its response to the counters."""
+        route = self.route(request.url.path, base_path)
+        sent_uncompressed = len(request.content)
+        sent = request.extensions.get(COMPRESSED_SIZE, sent_uncompressed)
+        with self._lock:
+            counts = self.routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "sent": 0,
+                    "sent_uncompressed": 0,
+                    "received": 0,
+                    "received_uncompressed": 0,
+                },
+            )
+            counts["requests"] += 1
+            counts["sent"] += sent
+            counts["sent_uncompressed"] += sent_uncompressed
+            counts["received"] += received
+            counts["received_uncompressed"] += uncompressed
+
+    def event_hooks(self, base_url: str = "") -> dict:
+        """Get the event hooks that record transfers for a client with a base URL."""
+        base_path = httpx.URL(base_url).path.rstrip("/")
+        return {"response": [lambda response: self.record_response(response, base_path)]}
+
+    def saved(self, route: str | None = None) -> int:
+        """Get the number of bytes saved by compression, for one route or all routes."""
+        with self._lock:
+            counts = [self.routes.get(route, {})] if route else list(self.routes.values())
+            return sum(
+                count.get("sent_uncompressed", 0)
+                - count.get("sent", 0)
+                + count.get("received_uncompressed", 0)
+                - count.get("received", 0)
+                for count in counts
+            )
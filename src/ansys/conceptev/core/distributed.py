@@ -0,0 +1,391 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Distributed execution of sweeps by workers that share a queue."""
+
+from dataclasses import dataclass
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Protocol
+import uuid
+
+import httpx
+
+from ansys.conceptev.core import app, cancellation
+from ansys.conceptev.core.cache import DiskCache
+from ansys.conceptev.core.journal import inputs_hash
+
+PENDING = "pending"
+CLAIMED = "claimed"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class Lease:
+    """Item of work that a worker has claimed until ``expires``."""
+
+    key: str
+    payload: dict
+    worker_id: str
+    attempt: int
+    expires: float
+    progress: dict | None = None
+
+
+class Broker(Protocol):
+    """Store of work items that workers claim with leases."""
+
+    def put(self, payload: dict, key: str | None = None) -> str:
+        """Add an item of work."""
+
+    def claim(self, worker_id: str) -> Lease | None:
+        """Claim the next item of work."""
+
+    def renew(self, lease: Lease) -> bool:
+        """Extend a lease."""
+
+    def progress(self, lease: Lease, progress: dict) -> bool:
+        """Record the progress of an item and extend its lease."""
+
+    def complete(self, lease: Lease, result) -> bool:
+        """Record the result of an item."""
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Record that an item failed."""
+
+    def release(self, lease: Lease) -> bool:
+        """Give an item back without counting the attempt."""
+
+
+class WorkQueue:
+    """Queue of work items in a SQLite file that several processes can share.
+
+    Items are claimed with a lease of ``lease_seconds``, which the worker renews while it
+    works on the item. An item whose lease has expired, for example because its worker
+    stopped, is given to the next worker that claims. Failed items are retried until they
+    have been attempted ``max_attempts`` times. Updates from a worker that has lost its
+    lease are ignored and return ``False``.
+
+    The file must be on a file system with working locks, so a local disk is safer than a
+    network share.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3):
+        """Open or create a queue."""
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, payload TEXT, state TEXT, "
+            "worker_id TEXT, lease_expires REAL, attempts INTEGER, progress TEXT, result TEXT, "
+            "error TEXT, updated_at REAL)"
+        )
+
+    def _write(self, query: str, params: tuple) -> int:
+        """Run an update in its own transaction and get the number of changed rows."""
+        with self._lock:
+            return self._db.execute(query, params).rowcount
+
+    def put(self, payload: dict, key: str | None = None) -> str:
+        """Add an item of work unless an item with the same key is already in the queue.
+
+        The key defaults to the JSON of the payload.
+        """
+        key = key or json.dumps(payload, sort_keys=True)
+        self._write(
+            "INSERT OR IGNORE INTO items VALUES (?, ?, ?, NULL, NULL, 0, NULL, NULL, NULL, ?)",
+            (key, json.dumps(payload), PENDING, time.time()),
+        )
+        return key
+
+    def claim(self, worker_id: str) -> Lease | None:
+        """Claim the next pending item or item with an expired lease."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT key, payload, attempts, progress FROM items WHERE state = ? "
+                    "OR (state = ? AND lease_expires < ?) ORDER BY rowid LIMIT 1",
+                    (PENDING, CLAIMED, now),
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                key, payload, attempts, progress = row
+                expires = now + self.lease_seconds
+                self._db.execute(
+                    "UPDATE items SET state = ?, worker_id = ?, lease_expires = ?, "
+                    "attempts = ?, updated_at = ? WHERE key = ?",
+                    (CLAIMED, worker_id, expires, attempts + 1, now, key),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return Lease(
+            key,
+            json.loads(payload),
+            worker_id,
+            attempts + 1,
+            expires,
+            json.loads(progress) if progress else None,
+        )
+
+    def renew(self, lease: Lease) -> bool:
+        """Extend a lease and say whether the worker still holds it."""
+        expires = time.time() + self.lease_seconds
+        changed = self._write(
+            "UPDATE items SET lease_expires = ? WHERE key = ? AND state = ? AND worker_id = ?",
+            (expires, lease.key, CLAIMED, lease.worker_id),
+        )
+        if changed:
+            lease.expires = expires
+        return bool(changed)
+
+    def progress(self, lease: Lease, progress: dict) -> bool:
+        """Record the progress of an item and extend its lease.
+
+        A worker that later claims the item after this one stopped gets the progress in
+        :attr:`Lease.progress`.
+        """
+        expires = time.time() + self.lease_seconds
+        changed = self._write(
+            "UPDATE items SET progress = ?, lease_expires = ?, updated_at = ? "
+            "WHERE key = ? AND state = ? AND worker_id = ?",
+            (json.dumps(progress), expires, time.time(), lease.key, CLAIMED, lease.worker_id),
+        )
+        if changed:
+            lease.expires = expires
+            lease.progress = progress
+        return bool(changed)
+
+    def complete(self, lease: Lease, result) -> bool:
+        """Record the result of an item."""
+        return bool(
+            self._write(
+                "UPDATE items SET state = ?, result = ?, updated_at = ? "
+                "WHERE key = ? AND state = ? AND worker_id = ?",
+                (COMPLETED, json.dumps(result), time.time(), lease.key, CLAIMED, lease.worker_id),
+            )
+        )
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Record that an item failed, and make it pending again if it can be retried."""
+        state = PENDING if lease.attempt < self.max_attempts else FAILED
+        return bool(
+            self._write(
+                "UPDATE items SET state = ?, error = ?, updated_at = ? "
+                "WHERE key = ? AND state = ? AND worker_id = ?",
+                (state, error, time.time(), lease.key, CLAIMED, lease.worker_id),
+            )
+        )
+
+    def release(self, lease: Lease) -> bool:
+        """Make a claimed item pending again without counting the attempt.
+
+        Its progress is kept for the next worker.
+        """
+        return bool(
+            self._write(
+                "UPDATE items SET state = ?, attempts = attempts - 1, updated_at = ? "
+                "WHERE key = ? AND state = ? AND worker_id = ?",
+                (PENDING, time.time(), lease.key, CLAIMED, lease.worker_id),
+            )
+        )
+
+    def counts(self) -> dict:
+        """Get the number of items in each state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall()
+        return {state: 0 for state in (PENDING, CLAIMED, COMPLETED, FAILED)} | dict(rows)
+
+    def results(self) -> dict:
+        """Get the results of the completed items by key."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, result FROM items WHERE state = ?", (COMPLETED,)
+            ).fetchall()
+        return {key: json.loads(result) for key, result in rows}
+
+    def close(self):
+        """Close the queue."""
+        self._db.close()
+
+
+def put_job(broker: Broker, concept: dict, account_id: str, hpc_id: str) -> str:
+    """Add a job for a concept to a queue, keyed by the hash of its inputs."""
+    payload = {"concept": concept, "account_id": account_id, "hpc_id": hpc_id}
+    return broker.put(payload, inputs_hash(concept, account_id, hpc_id))
+
+
+def shared_token(path: str, max_age: float = 1800, get_token: Callable[[], str] | None = None):
+    """Get a token that is shared by the workers on a machine through a file.
+
+    A new token is got with ``get_token``, which defaults to :func:`app.get_token`, when the
+    file is missing or older than ``max_age`` seconds. The file is only readable by its owner.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) < max_age:
+            with open(path) as f:
+                return f.read()
+    except OSError:
+        pass
+    token = (get_token or app.get_token)()
+    temporary = f"{path}.{uuid.uuid4().hex}"
+    with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+        f.write(token)
+    os.replace(temporary, path)
+    return token
+
+
+class Worker:
+    """Worker that runs the jobs in a queue.
+
+    Several workers, in one process or on several machines, can share a queue. A worker
+    claims a job, submits it with ``submit(client, concept, account_id, hpc_id)``, records
+    the ``job_info`` as progress and waits for its results with ``wait(client, job_info)``.
+    ``submit`` and ``wait`` default to :func:`app.create_submit_job` and
+    :func:`app.read_results`. If another worker had already submitted the job before its
+    lease expired, the job is not submitted again. The lease is renewed in the background
+    while the worker waits.
+
+    If ``cache`` is given, results are stored in it by the key of the job, and jobs whose
+    results are already cached are completed without being run.
+
+    Jobs run in the scope of a token that is a child of ``cancel_token``. When it is
+    cancelled, for example by ``stop(cancel=True)``, the current job stops waiting and is
+    released back to the queue for another worker.
+
+    If ``token_file`` is given, the ``Authorization`` header of the client is set from
+    :func:`shared_token` before each job is claimed, so long-running workers keep a valid token.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        client: httpx.Client,
+        worker_id: str | None = None,
+        submit: Callable | None = None,
+        wait: Callable | None = None,
+        cache: DiskCache | None = None,
+        renew_interval: float = 60,
+        cancel_token: cancellation.CancelToken | None = None,
+        token_file: str | None = None,
+        get_token: Callable[[], str] | None = None,
+        token_max_age: float = 1800,
+    ):
+        """Create a worker for a queue."""
+        self.broker = broker
+        self.client = client
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.submit = submit or app.create_submit_job
+        self.wait = wait or app.read_results
+        self.cache = cache
+        self.renew_interval = renew_interval
+        self.completed = 0
+        self.failed = 0
+        self.cancel_token = cancel_token
+        self.token_file = token_file
+        self.get_token = get_token
+        self.token_max_age = token_max_age
+        self._stop = threading.Event()
+        self._token = cancellation.CancelToken(parent=cancel_token)
+
+    def _keep_alive(self, lease: Lease, done: threading.Event):
+        """Renew a lease until an item is done."""
+        while not done.wait(self.renew_interval):
+            if not self.broker.renew(lease):
+                return
+
+    def _process(self, lease: Lease):
+        """Run the job of a lease."""
+        if self.cache is not None:
+            cached = self.cache.get(lease.key)
+            if cached is not None:
+                return cached
+        payload = lease.payload
+        if lease.progress and "job_info" in lease.progress:
+            job_info = lease.progress["job_info"]
+        else:
+            job_info = self.submit(
+                self.client, payload["concept"], payload["account_id"], payload["hpc_id"]
+            )
+            self.broker.progress(lease, {"job_info": job_info})
+        results = self.wait(self.client, job_info)
+        if self.cache is not None:
+            self.cache.set(lease.key, results)
+        return results
+
+    def run_one(self) -> bool:
+        """Claim and run one job, and say whether there was a job to run."""
+        if self._token.cancelled:
+            return False
+        if self.token_file and self.client is not None:
+            self.client.headers["Authorization"] = shared_token(
+                self.token_file, self.token_max_age, self.get_token
+            )
+        lease = self.broker.claim(self.worker_id)
+        if lease is None:
+            return False
+        done = threading.Event()
+        keep_alive = threading.Thread(target=self._keep_alive, args=(lease, done), daemon=True)
+        keep_alive.start()
+        try:
+            with cancellation.scope(self._token):
+                results = self._process(lease)
+        except cancellation.Cancelled:
+            self.broker.release(lease)
+        except Exception as error:
+            self.broker.fail(lease, str(error))
+            self.failed += 1
+        else:
+            self.broker.complete(lease, results)
+            self.completed += 1
+        finally:
+            done.set()
+            keep_alive.join()
+        return True
+
+    def run(self, poll_interval: float = 5, stop_when_empty: bool = True):
+        """Run jobs until the queue is empty, or until :meth:`stop` if not ``stop_when_empty``."""
+        self._stop.clear()
+        if self._token.cancelled:
+            self._token = cancellation.CancelToken(parent=self.cancel_token)
+        while not self._stop.is_set() and not self._token.cancelled:
+            if not self.run_one():
+                if stop_when_empty:
+                    return
+                self._stop.wait(poll_interval)
+
+    def stop(self, cancel: bool = False):
+        """Stop after the current job, or straight away if ``cancel`` is set."""
+        self._stop.set()
+        if cancel:
+            self._token.cancel("The worker was stopped.")
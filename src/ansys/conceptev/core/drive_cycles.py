@@ -0,0 +1,247 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Streaming ingestion and compaction of drive cycles before upload."""
+
+import hashlib
+import io
+from itertools import islice
+import json
+import os
+from typing import Iterable, Iterator
+import uuid
+
+import httpx
+import numpy as np
+
+from ansys.conceptev.core import app
+
+Chunk = tuple[np.ndarray, np.ndarray]
+
+
+def iter_csv_chunks(
+    filename: str, chunk_size: int = 100_000, delimiter: str = ",", skip_header: int = 1
+) -> Iterator[Chunk]:
+    """Read time and speed columns from a CSV file in chunks.
+
+    The first two columns of the file are read as time in seconds and speed in m/s.
+    """
+    with open(filename) as f:
+        for _ in range(skip_header):
+            next(f, None)
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            data = np.loadtxt(lines, delimiter=delimiter, usecols=(0, 1), ndmin=2)
+            yield data[:, 0], data[:, 1]
+
+
+def iter_binary_chunks(
+    filename: str, chunk_size: int = 100_000, dtype: str = "<f8"
+) -> Iterator[Chunk]:
+    """Read interleaved time and speed samples from a binary file in chunks."""
+    item_size = np.dtype(dtype).itemsize * 2
+    with open(filename, "rb") as f:
+        while True:
+            data = np.frombuffer(f.read(chunk_size * item_size), dtype=dtype)
+            if data.size == 0:
+                return
+            if data.size % 2:
+                raise Exception(f"Binary drive cycle {filename} has an incomplete sample.")
+            data = data.reshape(-1, 2)
+            yield data[:, 0], data[:, 1]
+
+
+def validate_chunk(times: np.ndarray, speeds: np.ndarray, previous_time: float | None = None):
+    """Check that a chunk of a drive cycle is valid.
+
+    Times must be finite and strictly increasing across chunks, and speeds must be finite and
+    not negative.
+    """
+    if not (np.all(np.isfinite(times)) and np.all(np.isfinite(speeds))):
+        raise Exception("Drive cycle contains values that are not finite.")
+    if previous_time is not None and times.size and times[0] <= previous_time:
+        raise Exception(f"Drive cycle time does not increase after {previous_time}.")
+    if np.any(np.diff(times) <= 0):
+        index = int(np.argmax(np.diff(times) <= 0))
+        raise Exception(f"Drive cycle time does not increase after {times[index]}.")
+    if np.any(speeds < 0):
+        raise Exception("Drive cycle contains negative speeds.")
+
+
+def decimate(times: np.ndarray, speeds: np.ndarray, tolerance: float) -> np.ndarray:
+    """Get the indices of the points to keep so that the speed error stays within tolerance.
+
+    The first and last points are always kept. Linear interpolation between the kept points
+    reproduces every dropped speed to within ``tolerance``.
+    """
+    keep = np.zeros(times.size, dtype=bool)
+    if times.size == 0:
+        return np.flatnonzero(keep)
+    keep[[0, -1]] = True
+    segments = [(0, times.size - 1)]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2:
+            continue
+        inner_times = times[start + 1 : end]
+        fraction = (inner_times - times[start]) / (times[end] - times[start])
+        interpolated = speeds[start] + fraction * (speeds[end] - speeds[start])
+        errors = np.abs(speeds[start + 1 : end] - interpolated)
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            segments.append((start, split))
+            segments.append((split, end))
+    return np.flatnonzero(keep)
+
+
+def compact_drive_cycle(
+    chunks: Iterable[Chunk], interval: float | None = None, tolerance: float | None = None
+) -> Chunk:
+    """Validate a stream of drive cycle chunks and compact it.
+
+    If ``interval`` is given, the cycle is resampled at that fixed time step. If ``tolerance``
+    is given, points that can be linearly interpolated to within that speed error are dropped.
+    Each chunk is processed on its own, with the last point of the previous chunk carried over,
+    so memory use depends on the size of the compacted cycle rather than the raw log.
+    """
+    out_times, out_speeds = [], []
+    last = None
+    next_time = None
+    for times, speeds in chunks:
+        validate_chunk(times, speeds, None if last is None else last[0])
+        if times.size == 0:
+            continue
+        if last is not None:
+            times = np.concatenate(([last[0]], times))
+            speeds = np.concatenate(([last[1]], speeds))
+        chunk_end = (times[-1], speeds[-1])
+        if interval is not None:
+            if next_time is None:
+                next_time = times[0]
+            grid = np.arange(next_time, times[-1] + interval * 1e-9, interval)
+            speeds = np.interp(grid, times, speeds)
+            times = grid
+            next_time = grid[-1] + interval if grid.size else next_time
+        if tolerance is not None and times.size:
+            keep = decimate(times, speeds, tolerance)
+            times, speeds = times[keep], speeds[keep]
+        if last is not None and interval is None and times.size:
+            times, speeds = times[1:], speeds[1:]
+        out_times.append(times)
+        out_speeds.append(speeds)
+        last = chunk_end
+    if not out_times:
+        raise Exception("Drive cycle is empty.")
+    return np.concatenate(out_times), np.concatenate(out_speeds)
+
+
+def to_csv(times: np.ndarray, speeds: np.ndarray) -> bytes:
+    """Write a drive cycle as compact CSV content."""
+    buffer = io.BytesIO()
+    np.savetxt(buffer, np.column_stack((times, speeds)), fmt="%.10g", delimiter=",")
+    return buffer.getvalue()
+
+
+def file_hash(filename: str, settings: dict | None = None, block_size: int = 1 << 20) -> str:
+    """Get a hash of the file content and the compaction settings."""
+    digest = hashlib.sha256(json.dumps(settings or {}, sort_keys=True).encode())
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_id_cache(cache_file: str) -> dict:
+    """Read a drive cycle ID cache, treating a missing or unreadable file as empty."""
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_id_cache(cache_file: str, key: str, drive_cycle_id: str):
+    """Add an ID to a drive cycle ID cache, replacing the file in one step."""
+    cache = _read_id_cache(cache_file)
+    cache[key] = drive_cycle_id
+    temporary = f"{cache_file}.{uuid.uuid4().hex}"
+    with open(temporary, "w") as f:
+        json.dump(cache, f)
+    os.replace(temporary, cache_file)
+
+
+def post_drive_cycle_file(
+    client: httpx.Client,
+    filename: str,
+    file_format: str = "csv",
+    interval: float | None = None,
+    tolerance: float | None = None,
+    chunk_size: int = 100_000,
+    cache_file: str | None = None,
+    params: dict | None = None,
+):
+    """Compact a drive cycle file and send it to ``/drive_cycles:from_file``.
+
+    The file is streamed in chunks of ``chunk_size`` samples, validated and compacted with
+    :func:`compact_drive_cycle`. If ``cache_file`` is given, the drive cycle ID returned by the
+    server is stored against a hash of the file, the settings, the server and the design
+    instance, and a later call with the same content returns the stored ID without reading or
+    uploading the file again. The cache file is replaced in one step, so scripts running at the
+    same time cannot leave it half written, and a cache that cannot be read is treated as empty.
+    """
+    key = None
+    if cache_file:
+        design_instance_id = (params or {}).get("design_instance_id")
+        settings = {
+            "interval": interval,
+            "tolerance": tolerance,
+            "base_url": str(client.base_url),
+            "design_instance_id": design_instance_id or app.get_design_instance_id(client),
+        }
+        key = file_hash(filename, settings)
+        cache = _read_id_cache(cache_file)
+        if key in cache:
+            return cache[key]
+
+    if file_format == "csv":
+        chunks = iter_csv_chunks(filename, chunk_size)
+    elif file_format == "binary":
+        chunks = iter_binary_chunks(filename, chunk_size)
+    else:
+        raise Exception(f"Unknown drive cycle file format {file_format}.")
+    content = to_csv(*compact_drive_cycle(chunks, interval, tolerance))
+    response = client.post(
+        url="/drive_cycles:from_file",
+        files={"file": (os.path.basename(filename), content, "text/csv")},
+        params=params,
+    )
+    drive_cycle = app.process_response(response)
+    drive_cycle_id = drive_cycle["id"] if isinstance(drive_cycle, dict) else drive_cycle
+
+    if cache_file:
+        _write_id_cache(cache_file, key, drive_cycle_id)
+    return drive_cycle_id
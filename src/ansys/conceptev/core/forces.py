@@ -0,0 +1,150 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Local road-load force calculations for screening configurations."""
+
+from typing import Sequence
+
+import httpx
+import numpy as np
+
+from ansys.conceptev.core import app
+
+AIR_DENSITY = 1.225
+GRAVITY = 9.80665
+
+
+def _config_values(configs: dict | Sequence[dict], key: str, default: float | None = None):
+    """Get a 1D array of a value from one or many configurations."""
+    if isinstance(configs, dict):
+        configs = [configs]
+    values = []
+    for config in configs:
+        value = config.get(key, default)
+        if value is None:
+            raise Exception(f"Configuration {config.get('name', '')} is missing {key}.")
+        values.append(value)
+    return np.asarray(values, dtype=float)
+
+
+def calculate_forces(
+    aero: dict | Sequence[dict],
+    mass: dict | Sequence[dict],
+    wheel: dict | Sequence[dict],
+    speeds: Sequence[float],
+    grades: Sequence[float] = (0.0,),
+    air_density: float = AIR_DENSITY,
+    gravity: float = GRAVITY,
+) -> dict[str, np.ndarray]:
+    """Calculate road-load forces for many configurations at once.
+
+    The ``aero``, ``mass`` and ``wheel`` arguments are configuration dictionaries, as posted to
+    ``/configurations``, or sequences of them. Sequences are paired element by element and a
+    single configuration is reused for every pair. Speeds are in m/s and grades are the
+    rise over run (``0.05`` is a 5 % slope). The wheel configuration can include a
+    ``rolling_resistance_coefficient``; if it does not, rolling resistance is zero.
+
+    Every returned array has the shape ``(configurations, grades, speeds)``.
+    """
+    drag_area = _config_values(aero, "drag_coefficient") * _config_values(
+        aero, "cross_sectional_area"
+    )
+    vehicle_mass = _config_values(mass, "mass")
+    rolling_radius = _config_values(wheel, "rolling_radius")
+    rolling_coefficient = _config_values(wheel, "rolling_resistance_coefficient", 0.0)
+    try:
+        drag_area, vehicle_mass, rolling_radius, rolling_coefficient = np.broadcast_arrays(
+            drag_area, vehicle_mass, rolling_radius, rolling_coefficient
+        )
+    except ValueError:
+        raise Exception("Aero, mass and wheel configurations must have matching lengths.")
+
+    speeds = np.asarray(speeds, dtype=float)[np.newaxis, np.newaxis, :]
+    angles = np.arctan(np.asarray(grades, dtype=float))[np.newaxis, :, np.newaxis]
+    drag_area = drag_area[:, np.newaxis, np.newaxis]
+    weight = (vehicle_mass * gravity)[:, np.newaxis, np.newaxis]
+
+    shape = (weight.shape[0], angles.shape[1], speeds.shape[2])
+    aero_force = np.broadcast_to(0.5 * air_density * drag_area * speeds * np.abs(speeds), shape)
+    rolling_force = rolling_coefficient[:, np.newaxis, np.newaxis] * weight * np.cos(angles)
+    rolling_force = rolling_force * np.sign(speeds)
+    grade_force = np.broadcast_to(weight * np.sin(angles), shape)
+    total_force = aero_force + rolling_force + grade_force
+    return {
+        "aero_force": aero_force,
+        "rolling_resistance_force": rolling_force,
+        "grade_force": grade_force,
+        "total_force": total_force,
+        "wheel_torque": total_force * rolling_radius[:, np.newaxis, np.newaxis],
+        "wheel_power": total_force * speeds,
+    }
+
+
+def validate_forces(
+    client: httpx.Client,
+    aero: dict | Sequence[dict],
+    mass: dict | Sequence[dict],
+    wheel: dict | Sequence[dict],
+    speeds: Sequence[float],
+    grades: Sequence[float] = (0.0,),
+    samples: int = 3,
+    rtol: float = 1e-3,
+    seed: int | None = None,
+) -> float:
+    """Spot-check local forces against the ``/configurations:calculate_forces`` route.
+
+    A random sample of configuration, grade and speed points is sent to the server one at a
+    time and the returned total force is compared with :func:`calculate_forces`. An error is
+    raised if any point differs by more than ``rtol``. The largest relative error is returned.
+    """
+    forces = calculate_forces(aero, mass, wheel, speeds, grades)["total_force"]
+    configs = []
+    for config in (aero, mass, wheel):
+        config = [config] if isinstance(config, dict) else list(config)
+        configs.append(config * forces.shape[0] if len(config) == 1 else config)
+    speeds = np.asarray(speeds, dtype=float)
+    grades = np.asarray(grades, dtype=float)
+
+    rng = np.random.default_rng(seed)
+    flat_indices = rng.choice(forces.size, size=min(samples, forces.size), replace=False)
+    max_error = 0.0
+    for config_index, grade_index, speed_index in zip(
+        *np.unravel_index(flat_indices, forces.shape)
+    ):
+        data = {
+            "aero": configs[0][config_index],
+            "mass": configs[1][config_index],
+            "wheel": configs[2][config_index],
+            "speed": float(speeds[speed_index]),
+            "grade": float(grades[grade_index]),
+        }
+        server_force = app.post(client, "/configurations:calculate_forces", data=data)
+        if isinstance(server_force, dict):
+            server_force = server_force["total_force"]
+        local_force = forces[config_index, grade_index, speed_index]
+        error = abs(local_force - server_force) / max(abs(server_force), 1e-9)
+        if error > rtol:
+            raise Exception(
+                f"Local force {local_force} differs from server force {server_force} for {data}."
+            )
+        max_error = max(max_error, error)
+    return max_error
@@ -0,0 +1,53 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Canonical hashing of API payloads."""
+
+import hashlib
+import json
+
+
+def _normalize(data):
+    """Replace floats with integer values by integers, so ``2`` and ``2.0`` encode the same."""
+    if isinstance(data, float) and data.is_integer():
+        return int(data)
+    if isinstance(data, dict):
+        return {key: _normalize(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_normalize(value) for value in data]
+    return data
+
+
+def canonical_json(data) -> bytes:
+    """Get a canonical JSON encoding of some data.
+
+    Keys are sorted, no whitespace is used and integral floats are written as integers, so
+    equal data always gives equal bytes.
+    """
+    return json.dumps(
+        _normalize(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def canonical_hash(data) -> str:
+    """Get a SHA-256 hash of the canonical JSON encoding of some data."""
+    return hashlib.sha256(canonical_json(data)).hexdigest()
@@ -0,0 +1,258 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Durable journal of submitted jobs, so that interrupted sweeps resume without resubmitting."""
+
+import json
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from ansys.conceptev.core import app, cancellation
+from ansys.conceptev.core.hashing import canonical_hash
+
+CREATED = "created"
+SUBMITTED = "submitted"
+COMPLETED = "completed"
+FAILED = "failed"
+
+FAILED_STATUSES = ("failed", "cancelled", "error")
+
+
+def inputs_hash(concept: dict, account_id: str, hpc_id: str) -> str:
+    """Get a hash of the inputs of a job.
+
+    The job name is not included, because it defaults to the time of submission.
+    """
+    return canonical_hash(
+        {
+            "requirement_ids": concept["requirements_ids"],
+            "architecture_id": concept["architecture_id"],
+            "concept_id": concept["id"],
+            "design_instance_id": concept["design_instance_id"],
+            "account_id": account_id,
+            "hpc_id": hpc_id,
+        }
+    )
+
+
+class JobJournal:
+    """SQLite journal of jobs, keyed by a hash of their inputs.
+
+    :meth:`submit` records each job as soon as it is created, and its ``job_info`` once it
+    has been started. If a job with the same inputs has already been submitted and has not
+    failed, its ``job_info`` is returned and nothing is submitted. A job that was created but
+    not started, for example because the process stopped in between, is started without
+    creating it again. :meth:`resume` reads the results of the jobs that were submitted but
+    not completed, for example after the driver process was restarted.
+
+    A job is only marked as failed when the server reports that it failed. If its results
+    cannot be read for another reason, such as running out of tries or a network error, it
+    stays submitted with the error recorded, and is not submitted again.
+    """
+
+    def __init__(self, path: str, store_results: bool = True):
+        """Open or create a journal.
+
+        If ``store_results`` is set, the results of completed jobs are stored in the journal
+        and returned without another request.
+        """
+        self.store_results = store_results
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (inputs_hash TEXT PRIMARY KEY, job_name TEXT, "
+                "concept_id TEXT, account_id TEXT, hpc_id TEXT, job_info TEXT, state TEXT, "
+                "submitted_at REAL, finished_at REAL, results TEXT, error TEXT)"
+            )
+
+    def _row(self, key: str) -> dict | None:
+        """Get the journal entry of a job."""
+        with self._lock:
+            cursor = self._db.execute("SELECT * FROM jobs WHERE inputs_hash = ?", (key,))
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        return self._entry(dict(zip(names, row))) if row else None
+
+    @staticmethod
+    def _entry(row: dict) -> dict:
+        """Decode the JSON columns of a journal row."""
+        row["job_info"] = json.loads(row["job_info"])
+        if row["results"] is not None:
+            row["results"] = json.loads(row["results"])
+        return row
+
+    def submit(
+        self,
+        client: httpx.Client,
+        concept: dict,
+        account_id: str,
+        hpc_id: str,
+        job_name: str | None = None,
+    ) -> dict:
+        """Submit a job unless the same job is already in the journal."""
+        key = inputs_hash(concept, account_id, hpc_id)
+        entry = self._row(key)
+        if entry and entry["state"] == CREATED:
+            return self._start(client, key, entry["job_info"])
+        if entry and entry["state"] != FAILED:
+            return entry["job_info"]
+
+        def created(job_start: dict):
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jobs "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, NULL)",
+                    (
+                        key,
+                        job_name,
+                        concept["id"],
+                        account_id,
+                        hpc_id,
+                        json.dumps(job_start),
+                        CREATED,
+                        time.time(),
+                    ),
+                )
+
+        kwargs = {} if job_name is None else {"job_name": job_name}
+        job_info = app.create_submit_job(
+            client, concept, account_id, hpc_id, on_created=created, **kwargs
+        )
+        self._started(key, job_info)
+        return job_info
+
+    def _start(self, client: httpx.Client, key: str, job_start: dict) -> dict:
+        """Start a job that was created but not started."""
+        job_info = app.post(client, "/jobs:start", data=job_start)
+        self._started(key, job_info)
+        return job_info
+
+    def _started(self, key: str, job_info: dict):
+        """Record that a job has been started."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE jobs SET job_info = ?, state = ?, submitted_at = ? WHERE inputs_hash = ?",
+                (json.dumps(job_info), SUBMITTED, time.time(), key),
+            )
+
+    def _finish(self, key: str, state: str, results=None, error: str | None = None):
+        """Record that a job has finished."""
+        stored = json.dumps(results) if results is not None and self.store_results else None
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, results = ?, error = ? "
+                "WHERE inputs_hash = ?",
+                (state, time.time(), stored, error, key),
+            )
+
+    def _server_failed(self, client: httpx.Client, job_info: dict) -> bool:
+        """Check whether the server reports that a job failed."""
+        try:
+            status = app.post(client, "/jobs:status", data=job_info)
+        except cancellation.Cancelled:
+            raise
+        except Exception:
+            return False
+        if isinstance(status, dict):
+            status = status.get("status")
+        return status in FAILED_STATUSES
+
+    def read_results(self, client: httpx.Client, key: str, **kwargs):
+        """Read the results of a job in the journal and record whether it completed.
+
+        Keyword arguments are passed to :func:`app.read_results`.
+        """
+        entry = self._row(key)
+        if entry is None:
+            raise Exception(f"Job {key} is not in the journal.")
+        if entry["state"] == COMPLETED and entry["results"] is not None:
+            return entry["results"]
+        job_info = entry["job_info"]
+        if entry["state"] == CREATED:
+            job_info = self._start(client, key, job_info)
+        try:
+            results = app.read_results(client, job_info, **kwargs)
+        except cancellation.Cancelled:
+            raise
+        except Exception as error:
+            if self._server_failed(client, job_info):
+                self._finish(key, FAILED, error=str(error))
+            else:
+                with self._lock, self._db:
+                    self._db.execute(
+                        "UPDATE jobs SET error = ? WHERE inputs_hash = ?", (str(error), key)
+                    )
+            raise
+        self._finish(key, COMPLETED, results)
+        return results
+
+    def resume(
+        self,
+        client: httpx.Client,
+        cancel_token: cancellation.CancelToken | None = None,
+        errors: dict | None = None,
+        **kwargs,
+    ) -> dict:
+        """Read the results of every job that was created or submitted but not completed.
+
+        The results are returned by inputs hash. The errors of jobs whose results cannot be
+        read are stored in ``errors`` by inputs hash if it is given, and are raised together
+        otherwise. If the operation is cancelled, the progress of the error holds the results
+        read so far.
+        """
+        results = {}
+        failures = {} if errors is None else errors
+        with cancellation.scope(cancel_token):
+            for entry in self.jobs(CREATED) + self.jobs(SUBMITTED):
+                key = entry["inputs_hash"]
+                try:
+                    results[key] = self.read_results(client, key, **kwargs)
+                except cancellation.Cancelled as error:
+                    error.progress = dict(error.progress or {}, results=results)
+                    raise
+                except Exception as error:
+                    failures[key] = error
+        if errors is None and failures:
+            details = "; ".join(f"{key}: {error}" for key, error in failures.items())
+            raise Exception(f"Failed to read the results of {len(failures)} jobs: {details}.")
+        return results
+
+    def jobs(self, state: str | None = None) -> list[dict]:
+        """Get the journal entries, optionally only those in a state."""
+        query = "SELECT * FROM jobs"
+        params = ()
+        if state:
+            query += " WHERE state = ?"
+            params = (state,)
+        with self._lock:
+            cursor = self._db.execute(query + " ORDER BY submitted_at", params)
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        return [self._entry(dict(zip(names, row))) for row in rows]
+
+    def close(self):
+        """Close the journal."""
+        self._db.close()
@@ -0,0 +1,221 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Event-driven job completion with a polling fallback."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+from itertools import takewhile
+import json
+import threading
+from typing import Callable, Iterable
+
+import httpx
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.cache import LRUCache
+
+FINISHED_STATUSES = ("finished", "failed", "cancelled", "error")
+
+
+def default_job_id(job_info) -> str:
+    """Get the ID of a job from its ``job_info``."""
+    if isinstance(job_info, dict):
+        for key in ("job_id", "id"):
+            if key in job_info:
+                return str(job_info[key])
+        if isinstance(job_info.get("job"), dict):
+            return default_job_id(job_info["job"])
+    raise Exception(f"Cannot find the job ID in {job_info}.")
+
+
+def parse_events(lines: Iterable[str]):
+    """Parse server-sent event lines into the data of each event."""
+    data = []
+    for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    if data:
+        yield "\n".join(data)
+
+
+class CompletionListener:
+    """Resolve futures for jobs when they finish.
+
+    The listener subscribes to the server-sent events of ``events_path``. Each event is JSON
+    with a job ID and a status, and lines starting with ``:`` are keep-alive comments. If the
+    events cannot be streamed, or the stream ends, the listener falls back to requesting
+    ``status_path`` for each job that has not finished. It polls every
+    ``min_interval`` seconds, and backs off by ``backoff`` up to ``max_interval`` while no
+    status changes. The future of a job resolves to the last status payload when the status
+    is one of ``finished_statuses``.
+
+    The final statuses of the last ``max_finished`` jobs are kept, so a job that finished
+    shortly before it was watched resolves straight away. Unless the listener is polling, the
+    status of each newly watched job is also requested once, by a pool of ``check_workers``
+    threads, for jobs that finished before the event stream connected.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        events_path: str = "/jobs:events",
+        status_path: app.Router = "/jobs:status",
+        job_id: Callable[[dict], str] = default_job_id,
+        finished_statuses: Iterable[str] = FINISHED_STATUSES,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        max_finished: int = 1024,
+        check_workers: int = 4,
+    ):
+        """Create a listener that uses a client."""
+        self.client = client
+        self.events_path = events_path
+        self.status_path = status_path
+        self.job_id = job_id
+        self.finished_statuses = set(finished_statuses)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.mode = None
+        self._jobs = {}
+        self._statuses = {}
+        self._finished = LRUCache(max_finished)
+        self._checks = ThreadPoolExecutor(check_workers, thread_name_prefix="job-status-check")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, job_info) -> Future:
+        """Get a future that resolves when a job finishes."""
+        key = self.job_id(job_info)
+        with self._lock:
+            if key in self._jobs:
+                return self._jobs[key][1]
+            future = Future()
+            if key in self._finished:
+                future.set_result(self._finished.get(key))
+                return future
+            self._jobs[key] = (job_info, future)
+        if self.mode != "polling":
+            self._checks.submit(contextvars.copy_context().run, self._check, key, job_info)
+        return future
+
+    def _check(self, key: str, job_info):
+        """Request the status of a job once, unless it has already finished."""
+        with self._lock:
+            if key not in self._jobs:
+                return
+        try:
+            self._update(key, app.post(self.client, self.status_path, job_info))
+        except Exception:
+            pass
+
+    def _update(self, key: str, payload) -> bool:
+        """Record a status for a job and say whether it changed.
+
+        Only the statuses of watched jobs are kept until they finish.
+        """
+        status = payload.get("status") if isinstance(payload, dict) else payload
+        with self._lock:
+            changed = self._statuses.get(key) != status
+            if status in self.finished_statuses:
+                self._statuses.pop(key, None)
+                if key not in self._finished:
+                    self._finished.set(key, payload)
+                if key in self._jobs:
+                    _, future = self._jobs.pop(key)
+                    future.set_result(payload)
+            elif key in self._jobs:
+                self._statuses[key] = status
+        return changed
+
+    def _listen(self) -> bool:
+        """Stream events until stopped and say whether streaming worked."""
+        try:
+            timeout = httpx.Timeout(self.client.timeout.connect, read=None)
+            with self.client.stream("GET", self.events_path, timeout=timeout) as response:
+                if response.status_code != 200:
+                    return False
+                self.mode = "events"
+                lines = takewhile(lambda _: not self._stop.is_set(), response.iter_lines())
+                for data in parse_events(lines):
+                    event = json.loads(data)
+                    self._update(self.job_id(event), event)
+        except Exception:
+            pass
+        return self._stop.is_set()
+
+    def _poll(self):
+        """Poll the status of unfinished jobs until stopped."""
+        self.mode = "polling"
+        interval = self.min_interval
+        while not self._stop.is_set():
+            with self._lock:
+                jobs = [(key, job_info) for key, (job_info, _) in self._jobs.items()]
+            changed = False
+            for key, job_info in jobs:
+                try:
+                    changed |= self._update(key, app.post(self.client, self.status_path, job_info))
+                except Exception:
+                    continue
+            if changed:
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+            self._stop.wait(interval)
+
+    def _run(self):
+        """Listen for events and poll if they are not available."""
+        if not self._listen():
+            self._poll()
+
+    def start(self) -> "CompletionListener":
+        """Start listening in a background thread."""
+        self._stop.clear()
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0):
+        """Stop listening.
+
+        An event stream stops at its next line, so servers should send keep-alive comments.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "CompletionListener":
+        """Start listening."""
+        return self.start()
+
+    def __exit__(self, *args):
+        """Stop listening."""
+        self.stop()
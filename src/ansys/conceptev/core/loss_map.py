@@ -0,0 +1,302 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Client-side evaluation of motor loss maps."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+from typing import Literal
+
+import httpx
+import numpy as np
+
+from ansys.conceptev.core import app, codec
+from ansys.conceptev.core.cache import LRUCache
+from ansys.conceptev.core.hashing import canonical_hash
+from ansys.conceptev.core.singleflight import requests
+
+Method = Literal["linear", "cubic"]
+
+IDENTITY_KEYS = ("id", "name", "design_instance_id")
+LOSS_MAP_TIMEOUT = 2000
+
+loss_map_cache = LRUCache(maxsize=64)
+_format_versions = {}
+_prefetcher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="loss-map-prefetch")
+
+
+def _hermite_basis(t: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Get the cubic Hermite basis functions at ``t``."""
+    t2 = t * t
+    t3 = t2 * t
+    return 2 * t3 - 3 * t2 + 1, t3 - 2 * t2 + t, -2 * t3 + 3 * t2, t3 - t2
+
+
+class LossMap:
+    """Motor losses on a grid of currents and phase advances.
+
+    The losses array is indexed as ``losses[phase_advance_index, current_index]``, which is the
+    layout returned by ``/components:get_display_data`` and used for contour plots. An array
+    with the axes the other way round is transposed if its shape makes that unambiguous.
+    """
+
+    def __init__(self, currents, phase_advances, losses):
+        """Create a loss map from the grid axes and loss values."""
+        currents = np.asarray(currents, dtype=float)
+        phase_advances = np.asarray(phase_advances, dtype=float)
+        losses = np.asarray(losses, dtype=float)
+        if losses.shape != (phase_advances.size, currents.size):
+            if losses.shape == (currents.size, phase_advances.size):
+                losses = losses.T
+            else:
+                raise Exception(
+                    f"Loss map shape {losses.shape} does not match {phase_advances.size} phase "
+                    f"advances and {currents.size} currents."
+                )
+        if currents.size < 2 or phase_advances.size < 2:
+            raise Exception("Loss map needs at least two currents and two phase advances.")
+        current_order = np.argsort(currents)
+        phase_order = np.argsort(phase_advances)
+        self.currents = currents[current_order]
+        self.phase_advances = phase_advances[phase_order]
+        if np.any(np.diff(self.currents) == 0) or np.any(np.diff(self.phase_advances) == 0):
+            raise Exception("Loss map axes contain repeated values.")
+        self.losses = losses[np.ix_(phase_order, current_order)]
+        self._gradients = None
+
+    @classmethod
+    def from_display_data(cls, data: dict) -> "LossMap":
+        """Create a loss map from the result of ``/components:get_display_data``."""
+        return cls(data["currents"], data["phase_advances"], data["losses_total"])
+
+    def _cells(self, axis: np.ndarray, values: np.ndarray):
+        """Get the cell index and the position within the cell for each value."""
+        index = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, axis.size - 2)
+        width = axis[index + 1] - axis[index]
+        return index, (values - axis[index]) / width, width
+
+    def losses_at(
+        self, currents, phase_advances, method: Method = "linear", fill_value: float = np.nan
+    ) -> np.ndarray:
+        """Get the losses at a batch of operating points.
+
+        ``currents`` and ``phase_advances`` are broadcast together. Points outside the grid get
+        ``fill_value``.
+        """
+        currents, phase_advances = np.broadcast_arrays(
+            np.asarray(currents, dtype=float), np.asarray(phase_advances, dtype=float)
+        )
+        i, u, dx = self._cells(self.currents, currents)
+        j, v, dy = self._cells(self.phase_advances, phase_advances)
+        z = self.losses
+        corners = z[j, i], z[j, i + 1], z[j + 1, i], z[j + 1, i + 1]
+        if method == "linear":
+            losses = (
+                corners[0] * (1 - u) * (1 - v)
+                + corners[1] * u * (1 - v)
+                + corners[2] * (1 - u) * v
+                + corners[3] * u * v
+            )
+        elif method == "cubic":
+            if self._gradients is None:
+                edge_order = 2 if min(z.shape) > 2 else 1
+                dz_dy, dz_dx = np.gradient(
+                    z, self.phase_advances, self.currents, edge_order=edge_order
+                )
+                dz_dxdy = np.gradient(dz_dx, self.phase_advances, axis=0, edge_order=edge_order)
+                self._gradients = dz_dx, dz_dy, dz_dxdy
+            dz_dx, dz_dy, dz_dxdy = self._gradients
+            hu = _hermite_basis(u)
+            hv = _hermite_basis(v)
+            losses = np.zeros(currents.shape)
+            for a, b in ((0, 0), (1, 0), (0, 1), (1, 1)):
+                value_u, slope_u = hu[2 * a], hu[2 * a + 1] * dx
+                value_v, slope_v = hv[2 * b], hv[2 * b + 1] * dy
+                jj, ii = j + b, i + a
+                losses += (
+                    value_u * value_v * z[jj, ii]
+                    + slope_u * value_v * dz_dx[jj, ii]
+                    + value_u * slope_v * dz_dy[jj, ii]
+                    + slope_u * slope_v * dz_dxdy[jj, ii]
+                )
+        else:
+            raise Exception(f"Unknown interpolation method {method}.")
+        outside = (
+            (currents < self.currents[0])
+            | (currents > self.currents[-1])
+            | (phase_advances < self.phase_advances[0])
+            | (phase_advances > self.phase_advances[-1])
+        )
+        return np.where(outside, fill_value, losses)
+
+    def efficiency_at(
+        self,
+        currents,
+        phase_advances,
+        output_power,
+        method: Method = "linear",
+        fill_value: float = np.nan,
+    ) -> np.ndarray:
+        """Get the efficiency at a batch of operating points.
+
+        ``output_power`` is the mechanical power at each point in W. It is positive when
+        motoring, where the efficiency is ``P / (P + losses)``, and negative when generating,
+        where it is ``(|P| - losses) / |P|``. The efficiency at zero power is zero.
+        """
+        currents, phase_advances, output_power = np.broadcast_arrays(
+            currents, phase_advances, np.asarray(output_power, dtype=float)
+        )
+        losses = self.losses_at(currents, phase_advances, method, fill_value)
+        power = np.abs(output_power)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = np.where(
+                output_power >= 0, power / (power + losses), (power - losses) / power
+            )
+        return np.where((power == 0) & ~np.isnan(losses), 0.0, efficiency)
+
+
+def component_hash(component: dict) -> str:
+    """Get a hash of the content of a component, without its ID and name."""
+    return canonical_hash(
+        {key: value for key, value in component.items() if key not in IDENTITY_KEYS}
+    )
+
+
+def data_format_version(client: httpx.Client) -> str:
+    """Get the data format version of the API, which is only requested once per URL."""
+    url = str(client.base_url)
+    if url not in _format_versions:
+        _format_versions[url] = str(
+            requests.do(
+                ("data_format_version", url), app.get, client, "/utilities:data_format_version"
+            )
+        )
+    return _format_versions[url]
+
+
+def _cached_post(
+    client: httpx.Client,
+    router: str,
+    component: dict,
+    data: dict,
+    params: dict,
+    cache,
+    timeout: float,
+) -> dict:
+    """Send a slow loss map request unless its result is cached.
+
+    The result is cached by the route, the data format version and the content of the
+    component, and identical requests in flight at the same time share one call.
+    """
+    key = f"{router}:{data_format_version(client)}:{component_hash(component)}"
+    if cache is not None:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    def send():
+        response = client.post(
+            url=router,
+            content=codec.dumps(data),
+            headers=app.JSON_HEADERS,
+            params=params,
+            timeout=timeout,
+        )
+        return app.process_response(response)
+
+    value = requests.do(("loss_map", str(client.base_url), key), send)
+    if cache is not None:
+        cache.set(key, value)
+    return value
+
+
+def get_display_data(
+    client: httpx.Client,
+    component: dict,
+    cache=loss_map_cache,
+    timeout: float = LOSS_MAP_TIMEOUT,
+) -> dict:
+    """Get the display data of a motor from ``/components:get_display_data``.
+
+    ``component`` is the motor as returned by ``/components``. ``cache`` can be an
+    :class:`LRUCache`, a :class:`DiskCache` to keep results between scripts, or ``None``.
+    Motors made from files are only matched if they use the same uploaded ``data_id``.
+    """
+    return _cached_post(
+        client,
+        "/components:get_display_data",
+        component,
+        {},
+        {"component_id": component["id"]},
+        cache,
+        timeout,
+    )
+
+
+def calculate_loss_map(
+    client: httpx.Client,
+    component: dict,
+    cache=loss_map_cache,
+    timeout: float = LOSS_MAP_TIMEOUT,
+) -> dict:
+    """Calculate the loss map of a motor with ``/components:calculate_loss_map``."""
+    return _cached_post(
+        client, "/components:calculate_loss_map", component, component, {}, cache, timeout
+    )
+
+
+def get_loss_map(
+    client: httpx.Client,
+    component: dict,
+    cache=loss_map_cache,
+    timeout: float = LOSS_MAP_TIMEOUT,
+) -> LossMap:
+    """Get the loss map of a motor."""
+    return LossMap.from_display_data(get_display_data(client, component, cache, timeout))
+
+
+def prefetch(
+    client: httpx.Client,
+    component: dict,
+    cache=loss_map_cache,
+    timeout: float = LOSS_MAP_TIMEOUT,
+) -> Future:
+    """Start getting the display data of a motor in the background.
+
+    A later :func:`get_display_data` for the same motor waits for the prefetch instead of
+    sending another request. The client must stay open until the future is done.
+    """
+    context = contextvars.copy_context()
+    return _prefetcher.submit(context.run, get_display_data, client, component, cache, timeout)
+
+
+def create_component(
+    client: httpx.Client,
+    data: dict,
+    cache=loss_map_cache,
+    prefetch_loss_map: bool = True,
+) -> dict:
+    """Create a component and, if it is a motor, start prefetching its loss map."""
+    created = app.post(client, "/components", data=data)
+    if prefetch_loss_map and str(created.get("component_type", "")).startswith("Motor"):
+        prefetch(client, created, cache)
+    return created
@@ -0,0 +1,202 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Incremental local mirror of the entities in a design instance."""
+
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.hashing import canonical_hash
+
+MIRRORED_ROUTERS = ("/concepts", "/configurations", "/components")
+
+
+class DesignInstanceMirror:
+    """Local SQLite mirror of the concepts, configurations and components in a design instance.
+
+    :meth:`sync` lists each route with the ETag from the previous sync, so unchanged
+    listings cost a ``304`` response. It only writes entities whose content hash has changed.
+    The :meth:`post`, :meth:`put` and :meth:`delete` methods call the API and update the
+    mirrored entity straight away. Reads with :meth:`get` and :meth:`list` are served from
+    memory. Requests are always sent for the design instance the mirror was opened for, even
+    if the design instance of the client has changed since.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        path: str = ":memory:",
+        routers: tuple[app.Router, ...] = MIRRORED_ROUTERS,
+    ):
+        """Open or create the mirror for the design instance of the client."""
+        self.client = client
+        self.routers = routers
+        self.design_instance_id = app.get_design_instance_id(client) or ""
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entities (design_instance_id TEXT, router TEXT, "
+                "id TEXT, hash TEXT, data TEXT, PRIMARY KEY (design_instance_id, router, id))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (design_instance_id TEXT, router TEXT, "
+                "etag TEXT, synced_at REAL, PRIMARY KEY (design_instance_id, router))"
+            )
+        self._entities = {router: {} for router in routers}
+        self._hashes = {router: {} for router in routers}
+        rows = self._db.execute(
+            "SELECT router, id, hash, data FROM entities WHERE design_instance_id = ?",
+            (self.design_instance_id,),
+        )
+        for router, id, hash, data in rows:
+            if router in self._entities:
+                self._entities[router][id] = json.loads(data)
+                self._hashes[router][id] = hash
+
+    def _scope(self):
+        """Send requests for the design instance of the mirror."""
+        if isinstance(self.client, app.ConceptEVClient) and self.design_instance_id:
+            return self.client.design_instance(self.design_instance_id)
+        return contextlib.nullcontext()
+
+    def _etag(self, router: app.Router) -> str | None:
+        """Get the ETag stored by the last sync of a route."""
+        row = self._db.execute(
+            "SELECT etag FROM sync_state WHERE design_instance_id = ? AND router = ?",
+            (self.design_instance_id, router),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store(self, router: app.Router, entity: dict) -> bool:
+        """Store an entity if its content has changed and say whether it did."""
+        hash = canonical_hash(entity)
+        if self._hashes[router].get(entity["id"]) == hash:
+            return False
+        self._db.execute(
+            "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?)",
+            (self.design_instance_id, router, entity["id"], hash, json.dumps(entity)),
+        )
+        self._entities[router][entity["id"]] = entity
+        self._hashes[router][entity["id"]] = hash
+        return True
+
+    def _remove(self, router: app.Router, id: str):
+        """Remove an entity from the mirror."""
+        self._db.execute(
+            "DELETE FROM entities WHERE design_instance_id = ? AND router = ? AND id = ?",
+            (self.design_instance_id, router, id),
+        )
+        self._entities[router].pop(id, None)
+        self._hashes[router].pop(id, None)
+
+    def sync(self) -> dict[str, dict[str, int]]:
+        """Bring the mirror up to date and count the added, updated and removed entities."""
+        changes = {}
+        for router in self.routers:
+            counts = {"added": 0, "updated": 0, "removed": 0}
+            changes[router] = counts
+            etag = self._etag(router)
+            with self._scope():
+                response = self.client.get(
+                    url=router, headers={"If-None-Match": etag} if etag else None
+                )
+            if response.status_code == 304:
+                continue
+            entities = app.process_response(response)
+            with self._lock, self._db:
+                seen = set()
+                for entity in entities:
+                    seen.add(entity["id"])
+                    is_new = entity["id"] not in self._entities[router]
+                    if self._store(router, entity):
+                        counts["added" if is_new else "updated"] += 1
+                for id in set(self._entities[router]) - seen:
+                    self._remove(router, id)
+                    counts["removed"] += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                    (self.design_instance_id, router, response.headers.get("ETag"), time.time()),
+                )
+        return changes
+
+    def refresh(self, router: app.Router, id: str) -> dict | None:
+        """Fetch one entity again and update the mirror."""
+        with self._scope():
+            response = self.client.get(url="/".join([router, id]))
+        with self._lock, self._db:
+            if response.status_code == 404:
+                self._remove(router, id)
+                return None
+            entity = app.process_response(response)
+            self._store(router, entity)
+        return entity
+
+    def get(self, router: app.Router, id: str) -> dict:
+        """Get a mirrored entity."""
+        try:
+            return self._entities[router][id]
+        except KeyError:
+            raise Exception(f"ID {id} from {router} is not in the mirror.")
+
+    def list(self, router: app.Router) -> list[dict]:
+        """Get all the mirrored entities from a route."""
+        return list(self._entities[router].values())
+
+    def post(self, router: app.Router, data: dict, params: dict = {}) -> dict:
+        """Send a POST request and mirror the created entity."""
+        with self._scope():
+            created = app.post(self.client, router, data, params)
+        if router in self._entities and isinstance(created, dict) and "id" in created:
+            with self._lock, self._db:
+                self._store(router, created)
+        return created
+
+    def put(self, router: app.Router, id: str, data: dict) -> dict:
+        """Send a PUT request and mirror the updated entity."""
+        with self._scope():
+            updated = app.put(self.client, router, id, data)
+        if router in self._entities:
+            if isinstance(updated, dict) and updated.get("id") == id:
+                with self._lock, self._db:
+                    self._store(router, updated)
+            else:
+                self.refresh(router, id)
+        return updated
+
+    def delete(self, router: app.Router, id: str):
+        """Send a DELETE request and remove the entity from the mirror."""
+        with self._scope():
+            app.delete(self.client, router, id)
+        if router in self._entities:
+            with self._lock, self._db:
+                self._remove(router, id)
+
+    def close(self):
+        """Close the mirror database."""
+        self._db.close()
@@ -0,0 +1,269 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Typed models of the entities returned by the API.
+
+When msgspec is installed, the models are msgspec structs and JSON content is decoded and
+checked straight into them. Otherwise they are slotted dataclasses that are built from the
+decoded dictionaries. Both use much less memory than dictionaries for large listings.
+
+Fields that a model does not define are dropped by :func:`decode`, unless ``keep_extra`` is
+set, in which case they are kept in the ``extra`` dictionary of the model.
+"""
+
+from dataclasses import dataclass, field, fields
+import types
+import typing
+
+import httpx
+
+from ansys.conceptev.core import app, codec
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+_required = object()
+
+
+def _model(cls: type) -> type:
+    """Turn a class with annotated fields into a msgspec struct or a slotted dataclass."""
+    if msgspec:
+        struct_fields = []
+        for name, hint in cls.__annotations__.items():
+            default = cls.__dict__.get(name, _required)
+            struct_fields.append((name, hint) if default is _required else (name, hint, default))
+        model = msgspec.defstruct(cls.__name__, struct_fields, kw_only=True, module=cls.__module__)
+        model.__doc__ = cls.__doc__
+        return model
+    for name in cls.__annotations__:
+        if isinstance(cls.__dict__.get(name), list):
+            setattr(cls, name, field(default_factory=list))
+    return dataclass(slots=True)(cls)
+
+
+@_model
+class Concept:
+    """Concept in a design instance."""
+
+    id: str
+    name: str
+    design_instance_id: str | None = None
+    design_id: str | None = None
+    project_id: str | None = None
+    user_id: str | None = None
+    architecture_id: str | None = None
+    capabilities_ids: list = []
+    components_ids: list = []
+    configurations_ids: list = []
+    drive_cycles_ids: list = []
+    jobs_ids: list = []
+    requirements_ids: list = []
+    extra: dict | None = None
+
+
+@_model
+class Component:
+    """Component such as a motor, transmission or battery."""
+
+    id: str
+    name: str | None = None
+    component_type: str | None = None
+    max_speed: float | None = None
+    max_torque: float | None = None
+    data_id: str | None = None
+    inverter_losses_included: bool | None = None
+    gear_ratios: list[float] | None = None
+    headline_efficiencies: list[float] | None = None
+    static_drags: list[float] | None = None
+    friction_ratios: list[float] | None = None
+    windage_ratios: list[float] | None = None
+    capacity: float | None = None
+    charge_acceptance_limit: float | None = None
+    internal_resistance: float | None = None
+    voltage_max: float | None = None
+    voltage_mid: float | None = None
+    voltage_min: float | None = None
+    extra: dict | None = None
+
+
+@_model
+class Configuration:
+    """Aero, mass or wheel configuration."""
+
+    id: str
+    name: str | None = None
+    config_type: str | None = None
+    drag_coefficient: float | None = None
+    cross_sectional_area: float | None = None
+    mass: float | None = None
+    rolling_radius: float | None = None
+    extra: dict | None = None
+
+
+@_model
+class Requirement:
+    """Requirement that a concept is tested against."""
+
+    id: str
+    name: str | None = None
+    requirement_type: str | None = None
+    speed: float | None = None
+    acceleration: float | None = None
+    aero_id: str | None = None
+    mass_id: str | None = None
+    wheel_id: str | None = None
+    state_of_charge: float | None = None
+    extra: dict | None = None
+
+
+@_model
+class Job:
+    """Job that solves a concept."""
+
+    id: str
+    job_name: str | None = None
+    status: str | None = None
+    concept_id: str | None = None
+    design_instance_id: str | None = None
+    extra: dict | None = None
+
+
+@_model
+class JobResult:
+    """Result of a job for one requirement."""
+
+    requirement_id: str | None = None
+    capability_curve: dict | None = None
+    extra: dict | None = None
+
+
+_field_types = {}
+
+
+def _field_names(model: type) -> tuple[str, ...]:
+    """Get the names of the fields of a model."""
+    if msgspec:
+        return model.__struct_fields__
+    return tuple(model_field.name for model_field in fields(model))
+
+
+def _allowed_types(model: type) -> dict[str, tuple[type, ...]]:
+    """Get the types allowed for each field of a dataclass model."""
+    if model not in _field_types:
+        hints = typing.get_type_hints(model)
+        allowed = {}
+        for name in _field_names(model):
+            hint = hints[name]
+            if isinstance(hint, types.UnionType) or typing.get_origin(hint) is typing.Union:
+                options = typing.get_args(hint)
+            else:
+                options = (hint,)
+            options = tuple(typing.get_origin(option) or option for option in options)
+            if float in options:
+                options += (int,)
+            allowed[name] = options
+        _field_types[model] = allowed
+    return _field_types[model]
+
+
+def from_dict(model: type, data: dict, keep_extra: bool = True):
+    """Create a model from a dictionary and check the types of its fields.
+
+    Fields that the model does not define are kept in ``extra`` if ``keep_extra`` is set.
+    """
+    if not isinstance(data, dict):
+        raise Exception(f"Invalid {model.__name__}: expected an object, got {data!r}.")
+    names = _field_names(model)
+    values = {}
+    extra = {}
+    for name, value in data.items():
+        if name in names and name != "extra":
+            values[name] = value
+        elif keep_extra:
+            extra[name] = value
+    if msgspec:
+        try:
+            instance = msgspec.convert(values, type=model)
+        except msgspec.ValidationError as error:
+            raise Exception(f"Invalid {model.__name__}: {error}.")
+        instance.extra = extra or None
+        return instance
+    allowed = _allowed_types(model)
+    for name, value in values.items():
+        bool_for_number = isinstance(value, bool) and bool not in allowed[name]
+        if not isinstance(value, allowed[name]) or bool_for_number:
+            raise Exception(f"Invalid {model.__name__}: {name} has the wrong type {value!r}.")
+    try:
+        return model(**values, extra=extra or None)
+    except TypeError as error:
+        raise Exception(f"Invalid {model.__name__}: {error}.")
+
+
+def to_dict(instance) -> dict:
+    """Get the dictionary of a model, including any extra fields."""
+    data = {
+        name: getattr(instance, name) for name in _field_names(type(instance)) if name != "extra"
+    }
+    data.update(instance.extra or {})
+    return data
+
+
+def decode(content: bytes | str, model: type, many: bool | None = None, keep_extra: bool = False):
+    """Decode JSON content into a model, or a list of models if the content is a list.
+
+    With msgspec, and without ``keep_extra``, the content is decoded straight into the models
+    without building dictionaries first.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    is_list = content.lstrip()[:1] == b"["
+    if many is None:
+        many = is_list
+    elif many and not is_list:
+        raise Exception(f"Invalid {model.__name__} list: expected a list.")
+    if msgspec and not keep_extra:
+        try:
+            return msgspec.json.decode(content, type=list[model] if many else model)
+        except msgspec.DecodeError as error:
+            raise Exception(f"Invalid {model.__name__}: {error}.")
+    data = codec.loads(content)
+    if many:
+        return [from_dict(model, item, keep_extra) for item in data]
+    return from_dict(model, data, keep_extra)
+
+
+def get(
+    client: httpx.Client,
+    router: app.Router,
+    model: type,
+    id: str | None = None,
+    params: dict | None = None,
+    keep_extra: bool = False,
+):
+    """Send a GET request and decode the response into a model or a list of models."""
+    path = "/".join([router, id]) if id else router
+    response = client.get(url=path, params=params)
+    if response.status_code not in (200, 201):
+        raise Exception(f"Response Failed:{response.content}")
+    return decode(response.content, model, keep_extra=keep_extra)
@@ -0,0 +1,151 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Lazy, paginated iteration over collection routes."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from typing import AsyncIterator, Iterator
+
+import httpx
+
+from ansys.conceptev.core import app
+
+
+def _page_params(params: dict | None, offset: int, page_size: int, offset_param, limit_param):
+    """Get the query parameters for one page."""
+    return {**(params or {}), offset_param: offset, limit_param: page_size}
+
+
+def _is_last_page(page, page_size: int) -> bool:
+    """Check whether there are no pages after this one.
+
+    A page that is longer than the page size means that the route ignored the paging
+    parameters and sent the whole collection.
+    """
+    return not isinstance(page, list) or len(page) != page_size
+
+
+def _first_id(page):
+    """Get the ID of the first item of a page, or the item itself if it has no ID."""
+    if not isinstance(page, list) or not page:
+        return None
+    first = page[0]
+    return first.get("id", first) if isinstance(first, dict) else first
+
+
+def _repeats(page, previous) -> bool:
+    """Check whether a page starts with the same item as the previous page.
+
+    This means that the route ignored the offset and sent the first page again.
+    """
+    return (
+        previous is not None
+        and _first_id(page) is not None
+        and (_first_id(page) == _first_id(previous))
+    )
+
+
+def iter_collection(
+    client: httpx.Client,
+    router: app.Router,
+    page_size: int = 100,
+    params: dict | None = None,
+    prefetch: bool = True,
+    offset_param: str = "skip",
+    limit_param: str = "limit",
+) -> Iterator[dict]:
+    """Iterate over the items of a collection route one page at a time.
+
+    Pages are requested with the ``offset_param`` and ``limit_param`` query parameters. If
+    ``prefetch`` is set, the next page is requested in a background thread while the current
+    page is being consumed, so at most two pages are held in memory. Iteration stops if a page
+    starts with the same item as the previous one, which happens when the route ignores the
+    offset.
+    """
+
+    def fetch(offset: int):
+        page_params = _page_params(params, offset, page_size, offset_param, limit_param)
+        return app.get(client, router, params=page_params)
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offset = 0
+        page = fetch(offset)
+        previous = None
+        while not _repeats(page, previous):
+            last = _is_last_page(page, page_size)
+            next_page = None
+            if not last and executor:
+                next_page = executor.submit(
+                    contextvars.copy_context().run, fetch, offset + page_size
+                )
+            yield from page if isinstance(page, list) else [page]
+            if last:
+                return
+            offset += page_size
+            previous = page
+            page = next_page.result() if next_page else fetch(offset)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_collection(
+    client: httpx.AsyncClient,
+    router: app.Router,
+    page_size: int = 100,
+    params: dict | None = None,
+    prefetch: bool = True,
+    offset_param: str = "skip",
+    limit_param: str = "limit",
+) -> AsyncIterator[dict]:
+    """Iterate over the items of a collection route from an async client.
+
+    This works like :func:`iter_collection`, with the next page requested in a task.
+    """
+
+    async def fetch(offset: int):
+        page_params = _page_params(params, offset, page_size, offset_param, limit_param)
+        return app.process_response(await client.get(url=router, params=page_params))
+
+    offset = 0
+    next_page = None
+    try:
+        page = await fetch(offset)
+        previous = None
+        while not _repeats(page, previous):
+            last = _is_last_page(page, page_size)
+            if not last and prefetch:
+                next_page = asyncio.ensure_future(fetch(offset + page_size))
+            for item in page if isinstance(page, list) else [page]:
+                yield item
+            if last:
+                return
+            offset += page_size
+            previous = page
+            page = await next_page if next_page else await fetch(offset)
+            next_page = None
+    finally:
+        if next_page:
+            next_page.cancel()
@@ -0,0 +1,163 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Multi-core post-processing of job results.
+
+Results go through four stages. They are downloaded in a thread pool, decoded and transformed
+in a process pool, and reduced in the calling process. Downloaded content is handed to the
+worker processes through shared memory instead of being pickled. A stage can start on one
+result while other results are still in earlier stages.
+"""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+import contextvars
+from multiprocessing import shared_memory
+import os
+from typing import Any, Callable, Iterable
+
+import httpx
+
+from ansys.conceptev.core import app, codec
+
+
+def _decode_and_transform(name: str, size: int, transform: Callable[[Any], Any] | None):
+    """Decode content from shared memory and transform it in a worker process."""
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        content = bytes(memory.buf[:size])
+    finally:
+        memory.close()
+    results = codec.loads(content)
+    return transform(results) if transform else results
+
+
+def _submit(executor: ThreadPoolExecutor, fn, *args) -> Future:
+    """Submit a call that runs in a copy of the current context, keeping its scopes."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _to_shared_memory(content: bytes) -> shared_memory.SharedMemory:
+    """Copy content into a new block of shared memory."""
+    memory = shared_memory.SharedMemory(create=True, size=max(len(content), 1))
+    memory.buf[: len(content)] = content
+    return memory
+
+
+class ResultsPipeline:
+    """Download, decode, transform and reduce the results of many jobs.
+
+    ``transform`` is called on the decoded results of each job in a worker process, so it
+    must be a function that can be pickled, such as a function defined at the top level of a
+    module. ``reduce`` is called in the calling process as ``reduce(accumulated, transformed)``
+    in the order that results finish, starting from ``initial``. Without ``reduce``, the
+    transformed results are returned as a list in the order of the jobs.
+    """
+
+    def __init__(
+        self,
+        transform: Callable[[Any], Any] | None = None,
+        reduce: Callable[[Any, Any], Any] | None = None,
+        initial: Any = None,
+        max_workers: int | None = None,
+        download_workers: int = 4,
+        max_pending: int | None = None,
+    ):
+        """Create a pipeline.
+
+        ``max_workers`` is the number of worker processes. At most ``max_pending`` downloaded
+        results, which defaults to twice the number of download workers and worker processes,
+        are held in shared memory at a time.
+        """
+        self.transform = transform
+        self.reduce = reduce
+        self.initial = initial
+        self.max_workers = max_workers
+        self.download_workers = download_workers
+        self.max_pending = max_pending
+
+    def run(
+        self,
+        client: httpx.Client,
+        job_infos: Iterable[dict],
+        calculate_units: bool = True,
+        download: Callable[[httpx.Client, dict], bytes] | None = None,
+    ):
+        """Process the results of some jobs.
+
+        ``download`` gets the undecoded results of one job and defaults to
+        :func:`app.read_results_content`.
+        """
+        if download is None:
+
+            def download(client, job_info):
+                return app.read_results_content(client, job_info, calculate_units)
+
+        job_infos = list(job_infos)
+        outputs = [None] * len(job_infos)
+        accumulated = self.initial
+        processes = self.max_workers or os.cpu_count() or 1
+        max_pending = self.max_pending or 2 * (self.download_workers + processes)
+        with ThreadPoolExecutor(self.download_workers) as downloads, ProcessPoolExecutor(
+            processes
+        ) as workers:
+            to_download = iter(enumerate(job_infos))
+            pending = {}
+            try:
+                for index, job_info in to_download:
+                    pending[_submit(downloads, download, client, job_info)] = (index, None)
+                    if len(pending) >= max_pending:
+                        break
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, memory = pending.pop(future)
+                        if memory is None:
+                            content = future.result()
+                            memory = _to_shared_memory(content)
+                            processing = workers.submit(
+                                _decode_and_transform, memory.name, len(content), self.transform
+                            )
+                            pending[processing] = (index, memory)
+                            continue
+                        memory.close()
+                        memory.unlink()
+                        output = future.result()
+                        if self.reduce:
+                            accumulated = self.reduce(accumulated, output)
+                        else:
+                            outputs[index] = output
+                        for index, job_info in to_download:
+                            pending[_submit(downloads, download, client, job_info)] = (index, None)
+                            break
+            finally:
+                for future, (_, memory) in pending.items():
+                    future.cancel()
+                    if memory is not None:
+                        memory.close()
+                        memory.unlink()
+        return accumulated if self.reduce else outputs
@@ -0,0 +1,93 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Batched and cached calculation of requirement examples."""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+import httpx
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.cache import LRUCache
+from ansys.conceptev.core.hashing import canonical_hash
+from ansys.conceptev.core.singleflight import requests
+
+examples_cache = LRUCache(maxsize=4096)
+
+
+def _examples_key(client: httpx.Client, requirement: dict) -> tuple:
+    """Get the cache key of a requirement payload."""
+    return (str(client.base_url), app.get_design_instance_id(client), canonical_hash(requirement))
+
+
+def calculate_examples(
+    client: httpx.Client, requirement: dict, cache: LRUCache | None = examples_cache
+) -> dict:
+    """Calculate the examples of a requirement with ``/requirements:calculate_examples``.
+
+    Results are kept in ``cache`` by the canonical hash of the payload and the design
+    instance, and identical requests in flight at the same time share one call. The cached
+    result is returned to every caller, so it must not be changed.
+    """
+    key = _examples_key(client, requirement)
+    if cache is not None:
+        examples = cache.get(key)
+        if examples is not None:
+            return examples
+    examples = requests.do(
+        ("calculate_examples",) + key,
+        app.post,
+        client,
+        "/requirements:calculate_examples",
+        data=requirement,
+    )
+    if cache is not None:
+        cache.set(key, examples)
+    return examples
+
+
+def calculate_examples_batch(
+    client: httpx.Client,
+    requirements: list[dict],
+    max_workers: int = 8,
+    cache: LRUCache | None = examples_cache,
+) -> list[dict]:
+    """Calculate the examples of many requirements.
+
+    Identical payloads are only sent once, and the unique payloads that are not cached are
+    sent with up to ``max_workers`` concurrent requests. The results are in the order of
+    ``requirements``. The requests use the design instance and cancellation scope of the
+    caller.
+    """
+    unique = {}
+    for requirement in requirements:
+        unique.setdefault(canonical_hash(requirement), requirement)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            key: executor.submit(
+                contextvars.copy_context().run, calculate_examples, client, requirement, cache
+            )
+            for key, requirement in unique.items()
+        }
+        examples = {key: future.result() for key, future in futures.items()}
+    return [examples[canonical_hash(requirement)] for requirement in requirements]
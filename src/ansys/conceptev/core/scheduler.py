@@ -0,0 +1,180 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Scheduling of jobs across accounts and HPCs with concurrency limits and priorities."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass
+import heapq
+import itertools
+import threading
+from typing import Callable
+
+import httpx
+
+from ansys.conceptev.core import app, cancellation
+
+
+@dataclass
+class Target:
+    """Account and HPC that jobs can be submitted to, with a limit on running jobs."""
+
+    account_id: str
+    hpc_id: str
+    max_concurrent: int = 4
+
+
+class JobScheduler:
+    """Submit jobs to several accounts and HPCs without going over their limits.
+
+    Jobs are added with :meth:`add` and started by :meth:`run` in order of priority, with
+    higher priorities first and jobs of equal priority in the order they were added. Each job
+    goes to the target with the lowest proportion of its limit in use. A job holds its slot
+    until its results have been read, and the slot is then given to the next job.
+
+    Targets on the same HPC also share the limit of the HPC, so spreading jobs across accounts
+    does not overfill its queue. ``hpc_limits`` maps HPC IDs to their limits, and an HPC that
+    is not in it is limited to the highest ``max_concurrent`` of its targets.
+
+    ``submit`` is called as ``submit(client, concept, account_id, hpc_id)`` and defaults to
+    :func:`app.create_submit_job`. A :class:`JobJournal`'s ``submit`` method can be used
+    instead. ``wait`` is called as ``wait(client, job_info)`` and defaults to
+    :func:`app.read_results`.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        targets: list[Target],
+        submit: Callable | None = None,
+        wait: Callable | None = None,
+        hpc_limits: dict[str, int] | None = None,
+    ):
+        """Create a scheduler for some targets."""
+        if not targets:
+            raise Exception("The scheduler needs at least one target.")
+        self.client = client
+        self.targets = targets
+        self.submit = submit or app.create_submit_job
+        self.wait = wait or app.read_results
+        self.running = [0] * len(targets)
+        self.hpc_limits = dict(hpc_limits or {})
+        for target in targets:
+            if hpc_limits is None or target.hpc_id not in hpc_limits:
+                self.hpc_limits[target.hpc_id] = max(
+                    self.hpc_limits.get(target.hpc_id, 0), target.max_concurrent
+                )
+        self.hpc_running = {hpc_id: 0 for hpc_id in self.hpc_limits}
+        self._queue = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+
+    def add(self, concept: dict, priority: int = 0) -> Future:
+        """Add a job for a concept and get a future for its results."""
+        future = Future()
+        with self._condition:
+            heapq.heappush(self._queue, (-priority, next(self._order), concept, future))
+            self._condition.notify_all()
+        return future
+
+    def _free_target(self) -> int | None:
+        """Get the index of the target with the lowest proportion of its limit in use.
+
+        Only targets whose HPC also has a free slot are considered.
+        """
+        free = [
+            index
+            for index, target in enumerate(self.targets)
+            if self.running[index] < target.max_concurrent
+            and self.hpc_running[target.hpc_id] < self.hpc_limits[target.hpc_id]
+        ]
+        if not free:
+            return None
+        return min(free, key=lambda index: self.running[index] / self.targets[index].max_concurrent)
+
+    def _execute(self, index: int, concept: dict, future: Future):
+        """Submit a job and wait for its results."""
+        target = self.targets[index]
+        try:
+            job_info = self.submit(self.client, concept, target.account_id, target.hpc_id)
+            future.set_result(self.wait(self.client, job_info))
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            with self._condition:
+                self.running[index] -= 1
+                self.hpc_running[target.hpc_id] -= 1
+                self._condition.notify_all()
+
+    def _cancel_queued(self, token: cancellation.CancelToken):
+        """Cancel the jobs that have not started."""
+        while self._queue:
+            _, _, _, future = heapq.heappop(self._queue)
+            if future.set_running_or_notify_cancel():
+                try:
+                    token.check()
+                except cancellation.Cancelled as error:
+                    future.set_exception(error)
+
+    def _notify(self, reason=None):
+        """Wake up the scheduling loop."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def run(self, cancel_token: cancellation.CancelToken | None = None):
+        """Run jobs until all the jobs that have been added have finished.
+
+        If ``cancel_token``, or the token of the current scope, is cancelled, jobs that have
+        not started fail with :class:`cancellation.Cancelled`. Running jobs are cancelled
+        through the token, which frees their slots.
+        """
+        max_workers = sum(target.max_concurrent for target in self.targets)
+        with cancellation.scope(cancel_token) as token:
+            if token is not None:
+                token.add_callback(self._notify)
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    with self._condition:
+                        while self._queue or any(self.running):
+                            if token is not None and token.cancelled:
+                                self._cancel_queued(token)
+                            index = self._free_target()
+                            if index is None or not self._queue:
+                                waiting = token is not None and not token.cancelled
+                                self._condition.wait(token.remaining() if waiting else None)
+                                continue
+                            _, _, concept, future = heapq.heappop(self._queue)
+                            if not future.set_running_or_notify_cancel():
+                                continue
+                            self.running[index] += 1
+                            self.hpc_running[self.targets[index].hpc_id] += 1
+                            executor.submit(
+                                contextvars.copy_context().run,
+                                self._execute,
+                                index,
+                                concept,
+                                future,
+                            )
+            finally:
+                if token is not None:
+                    token.remove_callback(self._notify)
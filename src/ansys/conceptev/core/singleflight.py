@@ -0,0 +1,179 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Coalescing of identical concurrent requests."""
+
+import asyncio
+from concurrent.futures import Future
+import contextvars
+import threading
+
+import httpx
+
+from ansys.conceptev.core import app, cancellation, codec
+from ansys.conceptev.core.hashing import canonical_json
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result.
+
+    A caller that asks for a key while a call for the same key is already running waits for
+    that call and gets its result or error, instead of running the function again. All
+    callers get the same result object, so they must not change it.
+
+    The shared call runs without any caller's cancellation token, and each caller waits for it
+    with its own token. A caller that is cancelled stops waiting without affecting the others.
+    If the first caller has a token, the call runs in a new thread so that it can stop waiting.
+    """
+
+    def __init__(self):
+        """Create an empty group of calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call a function, or wait for the call already running with the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if leader:
+            if cancellation.current() is None:
+                self._run(key, call, fn, args, kwargs)
+            else:
+                context = contextvars.copy_context()
+                threading.Thread(
+                    target=context.run,
+                    args=(self._run, key, call, fn, args, kwargs),
+                    daemon=True,
+                ).start()
+        return cancellation.result(call)
+
+    def _run(self, key, call: Future, fn, args, kwargs):
+        """Run a shared call without a cancellation token and set its result."""
+        try:
+            with cancellation.detached():
+                result = fn(*args, **kwargs)
+        except BaseException as error:
+            with self._lock:
+                del self._calls[key]
+            call.set_exception(error)
+        else:
+            with self._lock:
+                del self._calls[key]
+            call.set_result(result)
+
+    async def do_async(self, key, fn, *args, **kwargs):
+        """Await a coroutine function, or the call already running with the same key.
+
+        The call runs in its own task, so cancelling one waiting caller does not cancel the
+        call for the others.
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            if task is None:
+                with cancellation.detached():
+                    task = self._tasks[loop_key] = asyncio.ensure_future(fn(*args, **kwargs))
+                task.add_done_callback(lambda _: self._tasks.pop(loop_key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Get the number of calls in flight."""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+
+requests = SingleFlight()
+
+
+def _request_key(
+    client: httpx.Client | httpx.AsyncClient, method: str, path: str, params, data
+) -> tuple:
+    """Get a key that identifies a request from a client."""
+    return (
+        method,
+        str(client.base_url),
+        client.headers.get("Authorization"),
+        str(client.params),
+        app.get_design_instance_id(client),
+        path,
+        canonical_json(params),
+        canonical_json(data),
+    )
+
+
+def _path(router: app.Router, id: str | None) -> str:
+    """Get the path of a route and ID."""
+    return "/".join([router, id]) if id else router
+
+
+def get(
+    client: httpx.Client, router: app.Router, id: str | None = None, params: dict | None = None
+) -> dict:
+    """Send a GET request, sharing the response with identical requests in flight."""
+    key = _request_key(client, "GET", _path(router, id), params, None)
+    return requests.do(key, app.get, client, router, id=id, params=params)
+
+
+def post(client: httpx.Client, router: app.Router, data: dict, params: dict = {}) -> dict:
+    """Send a POST request, sharing the response with identical requests in flight.
+
+    Only use this for routes that compute a result without creating anything, such as
+    ``/components:calculate_loss_map``.
+    """
+    key = _request_key(client, "POST", router, params, data)
+    return requests.do(key, app.post, client, router, data=data, params=params)
+
+
+async def get_async(
+    client: httpx.AsyncClient,
+    router: app.Router,
+    id: str | None = None,
+    params: dict | None = None,
+) -> dict:
+    """Send a GET request from an async client, sharing the response with identical requests."""
+    path = _path(router, id)
+
+    async def send():
+        return app.process_response(await client.get(url=path, params=params))
+
+    return await requests.do_async(_request_key(client, "GET", path, params, None), send)
+
+
+async def post_async(
+    client: httpx.AsyncClient, router: app.Router, data: dict, params: dict = {}
+) -> dict:
+    """Send a POST request from an async client, sharing the response with identical requests.
+
+    Only use this for routes that compute a result without creating anything.
+    """
+
+    async def send():
+        response = await client.post(
+            url=router, content=codec.dumps(data), headers=app.JSON_HEADERS, params=params
+        )
+        return app.process_response(response)
+
+    return await requests.do_async(_request_key(client, "POST", router, params, data), send)
@@ -0,0 +1,147 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""In-memory snapshot of a concept and the entities that it references."""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+import httpx
+
+from ansys.conceptev.core import app
+
+REFERENCES = (
+    ("architecture_id", "/architectures", "architecture"),
+    ("components_ids", "/components", "components"),
+    ("configurations_ids", "/configurations", "configurations"),
+    ("requirements_ids", "/requirements", "requirements"),
+    ("drive_cycles_ids", "/drive_cycles", "drive_cycles"),
+)
+
+
+def _as_ids(value) -> list:
+    """Get a list of IDs from an ID field."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+class ConceptSnapshot:
+    """Indexed, in-memory copy of a concept and its architectures, components and so on.
+
+    Entities are looked up by ID with :meth:`get` and by name with :meth:`find`. Fields that
+    hold IDs, such as ``front_motor_id``, are turned into entities only when
+    :meth:`resolve` is called.
+    """
+
+    def __init__(self, concept: dict, client: httpx.Client | None = None):
+        """Create a snapshot of a concept."""
+        self.concept = concept
+        self.client = client
+        self._by_id = {}
+        self._by_name = {}
+        self._routers = {}
+
+    @classmethod
+    def load(cls, client: httpx.Client, concept_id: str, max_workers: int = 8) -> "ConceptSnapshot":
+        """Load a concept and fetch everything that it references.
+
+        The concept is requested populated. Any referenced entity that is not included in the
+        populated concept is fetched with up to ``max_workers`` concurrent requests.
+        """
+        concept = app.get(client, "/concepts", id=concept_id, params={"populated": True})
+        snapshot = cls(concept, client)
+        missing = []
+        for ids_field, router, populated_field in REFERENCES:
+            populated = concept.get(populated_field)
+            if isinstance(populated, dict):
+                populated = [populated]
+            for entity in populated or []:
+                if isinstance(entity, dict) and "id" in entity:
+                    snapshot.add(router, entity)
+            missing += [
+                (router, entity_id)
+                for entity_id in _as_ids(concept.get(ids_field))
+                if entity_id not in snapshot._by_id
+            ]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, app.get, client, router, id=id)
+                    for router, id in missing
+                ]
+                for (router, _), future in zip(missing, futures):
+                    snapshot.add(router, future.result())
+        return snapshot
+
+    def add(self, router: app.Router, entity: dict):
+        """Add an entity to the index."""
+        self._by_id[entity["id"]] = entity
+        self._routers[entity["id"]] = router
+        if "name" in entity:
+            self._by_name.setdefault(router, {})[entity["name"]] = entity
+
+    def get(self, id: str) -> dict:
+        """Get an entity by ID."""
+        try:
+            return self._by_id[id]
+        except KeyError:
+            raise Exception(f"ID {id} is not in the concept snapshot.")
+
+    def find(self, router: app.Router, name: str) -> dict:
+        """Get an entity of the type served by a route by name."""
+        try:
+            return self._by_name[router][name]
+        except KeyError:
+            raise Exception(f"No entity named {name} from {router} in the concept snapshot.")
+
+    def all(self, router: app.Router) -> list[dict]:
+        """Get every entity of the type served by a route."""
+        return [entity for id, entity in self._by_id.items() if self._routers[id] == router]
+
+    def resolve(self, entity: dict, field: str, router: app.Router | None = None):
+        """Get the entity or entities that a field of an entity refers to.
+
+        Fields ending in ``_ids`` give a list and fields ending in ``_id`` give one entity. An
+        ID that is not in the snapshot is fetched from ``router`` and added to the index.
+        """
+        ids = _as_ids(entity.get(field))
+        resolved = []
+        for id in ids:
+            if id not in self._by_id:
+                if router is None or self.client is None:
+                    raise Exception(f"ID {id} is not in the concept snapshot.")
+                self.add(router, app.get(self.client, router, id=id))
+            resolved.append(self._by_id[id])
+        if field.endswith("_ids"):
+            return resolved
+        return resolved[0] if resolved else None
+
+    def __contains__(self, id: str) -> bool:
+        """Check whether an ID is in the snapshot."""
+        return id in self._by_id
+
+    def __len__(self) -> int:
+        """Get the number of indexed entities."""
+        return len(self._by_id)
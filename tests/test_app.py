@@ -21,12 +21,15 @@
 # SOFTWARE.
 
 import os
+import threading
+import time
 
 import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
 from ansys.conceptev.core import app
+from ansys.conceptev.core.cancellation import Cancelled, CancelToken, DeadlineExceeded
 
 conceptev_url = os.environ["CONCEPTEV_URL"]
 ocm_url = os.environ["OCM_URL"]
@@ -332,3 +335,156 @@ def test_post_file(mocker, httpx_mock: HTTPXMock, client: httpx.Client):
 
     result = app.post_component_file(client, filename, component_file_type)
     assert result == file_post_response_data
+
+
+def test_ensure(httpx_mock: HTTPXMock, client: httpx.Client):
+    example_aero = {"name": "aero", "drag_coefficient": 0.3, "cross_sectional_area": 2.0}
+    existing = [
+        {"id": "1", "name": "other", "drag_coefficient": 0.3, "cross_sectional_area": 2},
+        {"id": "2", "name": "aero", "drag_coefficient": 0.3, "cross_sectional_area": 2},
+    ]
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="get",
+        json=existing,
+    )
+    index = {}
+    assert app.ensure(client, "/configurations", example_aero, index) == existing[1]
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations/2?design_instance_id=123",
+        method="get",
+        json=existing[1],
+    )
+    assert app.ensure(client, "/configurations", example_aero, index) == existing[1]
+
+    new_aero = dict(example_aero, name="new")
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="post",
+        match_json=new_aero,
+        json=dict(new_aero, id="3"),
+    )
+    assert app.ensure(client, "/configurations", new_aero, index)["id"] == "3"
+    assert len(httpx_mock.get_requests(method="POST")) == 1
+    assert len(httpx_mock.get_requests(method="GET")) == 3
+
+
+def test_design_instance(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=123", method="get", json=["default"]
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=456", method="get", json=["scoped"]
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=789&populated=true",
+        method="get",
+        json=["other"],
+    )
+    results = {}
+
+    def other_thread():
+        with client.design_instance("789"):
+            results["other"] = app.get(client, "/concepts", params={"populated": True})
+
+    with client.design_instance("456"):
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        assert app.get(client, "/concepts") == ["scoped"]
+    assert app.get(client, "/concepts") == ["default"]
+    assert results["other"] == ["other"]
+
+
+def test_get_design_instance_id(client: app.ConceptEVClient):
+    assert app.get_design_instance_id(client) == "123"
+    with client.design_instance("456"):
+        assert app.get_design_instance_id(client) == "456"
+    assert app.get_design_instance_id(httpx.Client()) is None
+
+
+def test_read_results_cancelled(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123", json=3
+    )
+    httpx_mock.add_response(method="post", status_code=429)
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled) as e:
+        app.read_results(client, {"job": "mocked_job"}, rate_limit=10, cancel_token=token)
+    assert time.monotonic() - start < 5
+    assert e.value.progress == {"tries": 1}
+    with pytest.raises(DeadlineExceeded):
+        app.read_results(client, {}, rate_limit=10, cancel_token=CancelToken(timeout=0.05))
+
+
+def test_create_submit_job_cancelled(httpx_mock: HTTPXMock, client: httpx.Client):
+    token = CancelToken()
+
+    def create_job(request: httpx.Request):
+        token.cancel()
+        return httpx.Response(status_code=200, json=[{"job": "data"}, {}])
+
+    httpx_mock.add_callback(create_job, url=f"{conceptev_url}/jobs?design_instance_id=123")
+    concept = {"requirements_ids": [], "architecture_id": "a", "id": "c", "design_instance_id": "d"}
+    with pytest.raises(Cancelled) as e:
+        app.create_submit_job(client, concept, "account", "hpc", cancel_token=token)
+    assert e.value.progress == {"job": {"job": "data"}}
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_ocm_cancelled(httpx_mock: HTTPXMock):
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(Cancelled):
+        app.get_account_ids("123", cancel_token=token)
+    assert httpx_mock.get_requests() == []
+
+    released = threading.Event()
+
+    def default_hpc(request: httpx.Request):
+        released.wait(5)
+        return httpx.Response(status_code=200, json={"hpcId": "345"})
+
+    httpx_mock.add_callback(default_hpc, url=f"{ocm_url}/account/hpc/default")
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        app.get_default_hpc("123", "567", cancel_token=token)
+    assert time.monotonic() - start < 2
+    released.set()
+
+
+def test_ensure_stale_index(httpx_mock: HTTPXMock, client: httpx.Client):
+    example_aero = {"name": "aero", "drag_coefficient": 0.3}
+    index = {app.canonical_hash(example_aero): "1"}
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations/1?design_instance_id=123",
+        method="get",
+        json={"id": "1", "name": "aero", "drag_coefficient": 0.5},
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="get",
+        json=[{"id": "1", "name": "aero", "drag_coefficient": 0.5}],
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="post",
+        json=dict(example_aero, id="2"),
+    )
+    assert app.ensure(client, "/configurations", example_aero, index)["id"] == "2"
+    assert index[app.canonical_hash(example_aero)] == "2"
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations/2?design_instance_id=123",
+        method="get",
+        status_code=500,
+    )
+    with pytest.raises(Exception) as e:
+        app.ensure(client, "/configurations", example_aero, index)
+    assert e.value.args[0].startswith("Response Failed:")
+    assert index[app.canonical_hash(example_aero)] == "2"
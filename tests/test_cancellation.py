@@ -0,0 +1,158 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import gc
+import threading
+import time
+
+import httpx
+import pytest
+
+from ansys.conceptev.core import app, cancellation, singleflight
+from ansys.conceptev.core.cancellation import Cancelled, CancelToken, DeadlineExceeded
+
+
+def test_sleep_cancelled():
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel, args=("Stopping.",)).start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled) as e:
+        token.sleep(10, progress={"done": 1})
+    assert time.monotonic() - start < 5
+    assert e.value.args[0] == "Stopping."
+    assert e.value.progress == {"done": 1}
+    assert not isinstance(e.value, DeadlineExceeded)
+
+
+def test_deadline():
+    token = CancelToken(timeout=0.05)
+    assert 0 < token.remaining() <= 0.05
+    assert token.timeout(httpx.Timeout(5.0)).read <= 0.05
+    assert CancelToken().timeout(httpx.Timeout(5.0)).read == 5.0
+    with pytest.raises(DeadlineExceeded):
+        token.sleep(10)
+    assert token.cancelled
+
+
+def test_child_token():
+    parent = CancelToken(timeout=10)
+    child = CancelToken(timeout=100, parent=parent)
+    assert child.deadline == parent.deadline
+    parent.cancel()
+    assert child.cancelled
+    assert CancelToken(parent=parent).cancelled
+
+
+def test_children_are_not_kept():
+    parent = CancelToken()
+    for _ in range(10):
+        CancelToken(parent=parent)
+    gc.collect()
+    assert parent._waiters == []
+
+
+def test_cancel_request_in_flight():
+    release = threading.Event()
+
+    def slow(request: httpx.Request):
+        release.wait(5)
+        return httpx.Response(status_code=200, json={"status": "ok"})
+
+    client = app.get_http_client("value1", transport=httpx.MockTransport(slow))
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        with cancellation.scope(token):
+            app.get(client, "/health")
+    assert time.monotonic() - start < 2
+    release.set()
+
+
+def test_shared_call_is_not_cancelled():
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(cancellation.current())
+        release.wait(5)
+        return "done"
+
+    group = singleflight.SingleFlight()
+    token = CancelToken()
+    results = []
+
+    def lead():
+        with cancellation.scope(token):
+            try:
+                group.do("key", slow)
+            except Cancelled as error:
+                results.append(error)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while group.in_flight() == 0:
+        time.sleep(0.01)
+    follower = threading.Thread(target=lambda: results.append(group.do("key", slow)))
+    follower.start()
+    token.cancel()
+    leader.join(5)
+    release.set()
+    follower.join(5)
+    assert isinstance(results[0], Cancelled)
+    assert results[1] == "done"
+    assert calls == [None]
+
+
+def test_scope():
+    token = CancelToken()
+    cancellation.check()
+    with cancellation.scope(token, {"step": 1}):
+        assert cancellation.current() is token
+        with cancellation.scope():
+            assert cancellation.current() is token
+        token.cancel()
+        with pytest.raises(Cancelled) as e:
+            with cancellation.scope(progress={"step": 2}):
+                cancellation.check()
+        assert e.value.progress == {"step": 2}
+    assert cancellation.current() is None
+
+
+def test_async_run():
+    async def main():
+        token = CancelToken()
+        asyncio.get_running_loop().call_later(0.05, token.cancel)
+        with pytest.raises(Cancelled):
+            await token.run(asyncio.sleep(10))
+        with pytest.raises(DeadlineExceeded):
+            await CancelToken(timeout=0.05).asleep(10)
+        other = CancelToken()
+        threading.Timer(0.05, other.cancel).start()
+        with pytest.raises(Cancelled):
+            await other.asleep(10)
+        return await CancelToken(timeout=10).run(asyncio.sleep(0, result="done"))
+
+    start = time.monotonic()
+    assert asyncio.run(main()) == "done"
+    assert time.monotonic() - start < 5
@@ -0,0 +1,153 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gzip
+import os
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, cassette
+from ansys.conceptev.core.cassette import RecordingTransport, ReplayTransport, read_cassette
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+def record_session(httpx_mock: HTTPXMock, path: str):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123", json=3
+    )
+    result_url = (
+        f"{conceptev_url}/jobs:result?design_instance_id=123&"
+        f"results_file_name=output_file_v3.json&calculate_units=true"
+    )
+    httpx_mock.add_response(url=result_url, method="post", status_code=202)
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(
+            status_code=200,
+            stream=httpx.ByteStream(gzip.compress(b'{"results": "returned"}')),
+            headers={"Content-Encoding": "gzip"},
+        ),
+        url=result_url,
+        method="post",
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components:upload?design_instance_id=123",
+        method="post",
+        content=b"\xff\x00",
+    )
+    transport = RecordingTransport(path)
+    with app.get_http_client("value1", "123", transport=transport) as client:
+        results = app.read_results(client, {"job": "mocked_job"}, rate_limit=0)
+        binary = client.post("/components:upload", content=b"file").content
+    return results, binary
+
+
+def test_record_and_replay(httpx_mock: HTTPXMock, tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    assert record_session(httpx_mock, path) == ({"results": "returned"}, b"\xff\x00")
+    records = read_cassette(path)
+    assert [record["status_code"] for record in records] == [200, 202, 200, 200]
+    assert "base64" in records[-1]
+    assert all("Authorization" not in str(record) for record in records)
+
+    transport = ReplayTransport(path)
+    with app.get_http_client("value1", "123", transport=transport) as client:
+        assert app.read_results(client, {"job": "mocked_job"}, rate_limit=0) == {
+            "results": "returned"
+        }
+        assert client.post("/components:upload", content=b"file").content == b"\xff\x00"
+        with pytest.raises(Exception) as e:
+            app.get(client, "/health")
+        assert e.value.args[0].startswith("No recorded response to GET")
+
+
+def test_replay_realtime(httpx_mock: HTTPXMock, tmp_path, monkeypatch):
+    path = str(tmp_path / "session.jsonl.gz")
+    record_session(httpx_mock, path)
+    records = read_cassette(path)
+    transport = ReplayTransport(path, realtime=True, time_scale=0)
+    start = time.perf_counter()
+    with app.get_http_client("value1", "123", transport=transport) as client:
+        response = client.get("/utilities:data_format_version")
+    assert response.json() == 3
+    assert time.perf_counter() - start < 1 + records[0]["elapsed"]
+    assert isinstance(transport, httpx.BaseTransport)
+
+    delays = []
+    monkeypatch.setattr(cassette.time, "sleep", delays.append)
+    transport = ReplayTransport(path, realtime=True, time_scale=0.5)
+    with app.get_http_client("value1", "123", transport=transport) as client:
+        client.get("/utilities:data_format_version")
+    assert delays == [records[0]["elapsed"] * 0.5]
+
+
+def run_workflow(client: httpx.Client, ocm_client: httpx.Client, filename: str, job_name: str):
+    uploaded = app.post_component_file(client, filename, "motor_lab_file")
+    concept = {"requirements_ids": [], "architecture_id": "a", "id": "c", "design_instance_id": "d"}
+    job_info = app.create_submit_job(client, concept, "account", "hpc", job_name)
+    project = app.create_new_project(client, "account", "hpc", "title", ocm_client=ocm_client)
+    return uploaded, job_info, project
+
+
+def test_replay_workflow(httpx_mock: HTTPXMock, tmp_path):
+    ocm_url = os.environ["OCM_URL"]
+    filename = str(tmp_path / "motor.lab")
+    with open(filename, "w") as f:
+        f.write("motor data")
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components:upload?"
+        "component_file_type=motor_lab_file&design_instance_id=123",
+        json=["data_id", 1000],
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs?design_instance_id=123", json=[{"job": "data"}, {}]
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:start?design_instance_id=123", json={"job_id": "1"}
+    )
+    httpx_mock.add_response(url=f"{ocm_url}/project/create", json={"projectId": "p"})
+    httpx_mock.add_response(
+        url=f"{ocm_url}/product/list", json=[{"productId": "1", "productName": "CONCEPTEV"}]
+    )
+    httpx_mock.add_response(
+        url=f"{ocm_url}/design/create",
+        json={"designId": "d", "designInstanceList": [{"designInstanceId": "i"}]},
+    )
+    httpx_mock.add_response(url=f"{ocm_url}/user/details", json={"userId": "u"})
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=123", json={"id": "c"}
+    )
+
+    path = str(tmp_path / "session.jsonl.gz")
+    ocm_path = str(tmp_path / "ocm.jsonl.gz")
+    with app.get_http_client("value1", "123", transport=RecordingTransport(path)) as client:
+        with app.get_ocm_client(RecordingTransport(ocm_path)) as ocm_client:
+            recorded = run_workflow(client, ocm_client, filename, "first run")
+    assert len(read_cassette(ocm_path)) == 4
+
+    with app.get_http_client("value1", "123", transport=ReplayTransport(path)) as client:
+        with app.get_ocm_client(ReplayTransport(ocm_path)) as ocm_client:
+            assert run_workflow(client, ocm_client, filename, "second run") == recorded
+    assert len(httpx_mock.get_requests()) == 8
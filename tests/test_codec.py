@@ -0,0 +1,64 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import httpx
+import pytest
+
+from ansys.conceptev.core import app, codec
+
+AVAILABLE_CODECS = [
+    name
+    for name, module in (("json", True), ("orjson", codec.orjson), ("msgspec", codec.msgspec))
+    if module
+]
+
+
+@pytest.fixture(params=AVAILABLE_CODECS)
+def codec_name(request):
+    previous = codec.codec.name
+    yield codec.set_codec(request.param).name
+    codec.set_codec(previous)
+
+
+def test_round_trip(codec_name):
+    data = {"name": "results", "speeds": [0.0, 1.5, 3], "nested": [{"a": None, "b": True}]}
+    assert codec.codec.name == codec_name
+    assert codec.loads(codec.dumps(data)) == data
+    assert codec.loads(codec.dumps(data).decode()) == data
+
+
+def test_decode_errors(codec_name):
+    with pytest.raises(codec.decode_errors()):
+        codec.loads(b"hello")
+
+
+def test_process_response(codec_name):
+    content = app.process_response(httpx.Response(status_code=200, content=b'{"hello":"a"}'))
+    assert content == {"hello": "a"}
+    assert app.process_response(httpx.Response(status_code=200, content=b"hello")) == b"hello"
+
+
+def test_get_codec():
+    assert codec.get_codec("json").name == "json"
+    with pytest.raises(Exception) as e:
+        codec.get_codec("yaml")
+    assert e.value.args[0] == "JSON codec yaml is not available."
@@ -0,0 +1,121 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gzip
+import json
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, compression
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+def test_accept_encoding(mocker):
+    mocker.patch.object(compression, "decodable_encodings", return_value={"gzip", "deflate"})
+    assert compression.accept_encoding() == "gzip, deflate;q=0.67"
+    assert compression.accept_encoding(["deflate"]) == "deflate"
+    assert compression.accept_encoding(["zstd"]) == "identity"
+
+
+def test_compress():
+    assert gzip.decompress(compression.compress(b"data" * 100, "gzip")) == b"data" * 100
+    with pytest.raises(Exception) as e:
+        compression.compress(b"data", "lzma")
+    assert e.value.args[0] == "Cannot compress request bodies with lzma."
+
+
+def test_get_http_client_accept_encodings():
+    client = app.get_http_client("value1", accept_encodings=["gzip"])
+    assert client.headers["Accept-Encoding"] == "gzip"
+
+
+def test_compressed_transfer(httpx_mock: HTTPXMock):
+    stats = compression.TransferStats()
+    client = app.get_http_client(
+        "value1", design_instance_id="123", request_encoding="gzip", stats=stats
+    )
+    results = {"speeds": list(range(2000))}
+    results_content = json.dumps(results).encode()
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(
+            status_code=200,
+            stream=httpx.ByteStream(gzip.compress(results_content)),
+            headers={"Content-Encoding": "gzip"},
+        ),
+        url=f"{conceptev_url}/jobs:result?design_instance_id=123",
+        method="post",
+        match_headers={"Content-Encoding": "gzip"},
+    )
+    job_info = {"job": "mocked_job", "inputs": ["value"] * 500}
+    assert app.post(client, "/jobs:result", job_info) == results
+    request = httpx_mock.get_requests()[0]
+    assert json.loads(gzip.decompress(request.content)) == job_info
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/health?design_instance_id=123", method="get", json="OK"
+    )
+    app.get(client, "/health")
+
+    counts = stats.routes["/jobs:result"]
+    assert counts["requests"] == 1
+    assert counts["sent"] == len(request.content)
+    assert counts["sent_uncompressed"] > 5 * counts["sent"]
+    assert counts["received_uncompressed"] == len(results_content)
+    assert counts["received"] < counts["received_uncompressed"]
+    assert stats.routes["/health"]["sent"] == 0
+    assert stats.saved() == stats.saved("/jobs:result") > 0
+
+
+def test_transfer_stats_streaming(httpx_mock: HTTPXMock):
+    stats = compression.TransferStats()
+    client = app.get_http_client("value1", design_instance_id="123", stats=stats)
+    chunks = [b"x" * 1000] * 3
+
+    def stream_chunks():
+        yield chunks[0]
+        assert "/drive_cycles" not in stats.routes
+        yield from chunks[1:]
+
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(status_code=200, stream=httpx.ByteStream(b"{}")),
+        url=f"{conceptev_url}/concepts/a?design_instance_id=123",
+    )
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(status_code=200, stream=httpx.ByteStream(b"{}")),
+        url=f"{conceptev_url}/concepts/b?design_instance_id=123",
+    )
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(status_code=200, content=stream_chunks()),
+        url=f"{conceptev_url}/drive_cycles?design_instance_id=123",
+    )
+    app.get(client, "/concepts", id="a")
+    app.get(client, "/concepts", id="b")
+    with client.stream("GET", "/drive_cycles") as response:
+        assert "/drive_cycles" not in stats.routes
+        assert b"".join(response.iter_bytes()) == b"".join(chunks)
+    assert set(stats.routes) == {"/concepts", "/drive_cycles"}
+    assert stats.routes["/concepts"]["requests"] == 2
+    assert stats.routes["/drive_cycles"]["received_uncompressed"] == 3000
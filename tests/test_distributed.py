@@ -0,0 +1,166 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import threading
+import time
+
+import httpx
+import pytest
+
+from ansys.conceptev.core import cancellation, distributed
+from ansys.conceptev.core.cache import DiskCache
+from ansys.conceptev.core.distributed import Worker, WorkQueue
+
+
+def concept(index):
+    return {
+        "requirements_ids": ["abc"],
+        "architecture_id": "def",
+        "id": f"concept{index}",
+        "design_instance_id": "jkl",
+    }
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "queue.sqlite")
+
+
+def test_workers_share_queue(queue_path, tmp_path):
+    queue = WorkQueue(queue_path)
+    keys = [distributed.put_job(queue, concept(index), "account", "hpc") for index in range(20)]
+    assert distributed.put_job(queue, concept(0), "account", "hpc") == keys[0]
+    assert queue.counts()["pending"] == 20
+    submitted = []
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+
+    def submit(client, concept, account_id, hpc_id):
+        submitted.append(concept["id"])
+        return {"job_id": concept["id"]}
+
+    def wait(client, job_info):
+        return {"result": job_info["job_id"]}
+
+    workers = [
+        Worker(WorkQueue(queue_path), None, f"worker{index}", submit, wait, cache)
+        for index in range(3)
+    ]
+    threads = [threading.Thread(target=worker.run) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert sorted(submitted) == sorted(f"concept{index}" for index in range(20))
+    assert sum(worker.completed for worker in workers) == 20
+    assert queue.counts() == {"pending": 0, "claimed": 0, "completed": 20, "failed": 0}
+    assert queue.results()[keys[3]] == {"result": "concept3"}
+    assert cache.get(keys[3]) == {"result": "concept3"}
+
+
+def test_expired_lease(queue_path):
+    queue = WorkQueue(queue_path, lease_seconds=0.05, max_attempts=2)
+    queue.put({"a": 1}, "item")
+    lease = queue.claim("first")
+    assert queue.claim("second") is None
+    assert queue.progress(lease, {"job_info": {"job_id": "1"}})
+    time.sleep(0.1)
+    reclaimed = queue.claim("second")
+    assert reclaimed.attempt == 2
+    assert reclaimed.progress == {"job_info": {"job_id": "1"}}
+    assert not queue.complete(lease, {"late": True})
+    assert not queue.renew(lease)
+    assert queue.fail(reclaimed, "error")
+    assert queue.counts()["failed"] == 1
+
+
+def test_worker_resumes_submitted_job(queue_path):
+    queue = WorkQueue(queue_path, lease_seconds=0.05)
+    queue.put({"concept": concept(0), "account_id": "a", "hpc_id": "h"}, "item")
+    queue.progress(queue.claim("stopped"), {"job_info": {"job_id": "1"}})
+    time.sleep(0.1)
+
+    def submit(*args):
+        raise Exception("Submitted again.")
+
+    worker = Worker(queue, None, submit=submit, wait=lambda client, job_info: job_info)
+    worker.run()
+    assert worker.failed == 0
+    assert queue.results() == {"item": {"job_id": "1"}}
+
+
+def test_worker_stop_releases_job(queue_path):
+    queue = WorkQueue(queue_path)
+    queue.put({"concept": concept(0), "account_id": "a", "hpc_id": "h"}, "item")
+    started = threading.Event()
+
+    def wait(client, job_info):
+        started.set()
+        cancellation.sleep(10)
+
+    worker = Worker(queue, None, submit=lambda *args: {"job_id": "1"}, wait=wait)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    started.wait(5)
+    worker.stop(cancel=True)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert queue.counts()["pending"] == 1
+    lease = queue.claim("next")
+    assert lease.attempt == 1
+    assert lease.progress == {"job_info": {"job_id": "1"}}
+
+
+def test_shared_token(tmp_path):
+    path = str(tmp_path / "token")
+    tokens = iter(["one", "two"])
+    assert distributed.shared_token(path, get_token=lambda: next(tokens)) == "one"
+    assert distributed.shared_token(path, get_token=lambda: next(tokens)) == "one"
+    os.utime(path, (0, 0))
+    assert distributed.shared_token(path, get_token=lambda: next(tokens)) == "two"
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_worker_refreshes_token(queue_path, tmp_path):
+    queue = WorkQueue(queue_path)
+    for index in range(2):
+        queue.put({"concept": concept(index), "account_id": "a", "hpc_id": "h"}, f"item{index}")
+    path = str(tmp_path / "token")
+    tokens = iter(["one", "two", "three"])
+    seen = []
+
+    def submit(client, concept, account_id, hpc_id):
+        seen.append(client.headers["Authorization"])
+        os.utime(path, (0, 0))
+        return {"job_id": concept["id"]}
+
+    client = httpx.Client(headers={"Authorization": "old"})
+    worker = Worker(
+        queue,
+        client,
+        submit=submit,
+        wait=lambda client, job_info: job_info,
+        token_file=path,
+        get_token=lambda: next(tokens),
+    )
+    worker.run()
+    assert seen == ["one", "two"]
@@ -0,0 +1,152 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, drive_cycles
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+@pytest.fixture
+def cycle():
+    times = np.arange(0, 100, 0.01)
+    speeds = 10 + 5 * np.sin(times / 10)
+    return times, speeds
+
+
+@pytest.fixture
+def csv_file(tmp_path, cycle):
+    filename = tmp_path / "cycle.csv"
+    np.savetxt(filename, np.column_stack(cycle), delimiter=",", header="time,speed")
+    return str(filename)
+
+
+def test_iter_csv_chunks(csv_file, cycle):
+    chunks = list(drive_cycles.iter_csv_chunks(csv_file, chunk_size=3000))
+    assert [chunk[0].size for chunk in chunks] == [3000, 3000, 3000, 1000]
+    np.testing.assert_allclose(np.concatenate([chunk[1] for chunk in chunks]), cycle[1])
+
+
+def test_iter_binary_chunks(tmp_path, cycle):
+    filename = tmp_path / "cycle.bin"
+    np.column_stack(cycle).astype("<f8").tofile(filename)
+    chunks = list(drive_cycles.iter_binary_chunks(str(filename), chunk_size=4000))
+    assert len(chunks) == 3
+    np.testing.assert_array_equal(np.concatenate([chunk[0] for chunk in chunks]), cycle[0])
+
+
+def test_validate_chunk():
+    drive_cycles.validate_chunk(np.array([1.0, 2.0]), np.array([0.0, 1.0]), previous_time=0.5)
+    with pytest.raises(Exception) as e:
+        drive_cycles.validate_chunk(np.array([1.0, 2.0]), np.array([0.0, 1.0]), previous_time=1)
+    assert e.value.args[0] == "Drive cycle time does not increase after 1."
+    with pytest.raises(Exception) as e:
+        drive_cycles.validate_chunk(np.array([1.0, 1.0]), np.array([0.0, 1.0]))
+    assert e.value.args[0] == "Drive cycle time does not increase after 1.0."
+    with pytest.raises(Exception) as e:
+        drive_cycles.validate_chunk(np.array([1.0, 2.0]), np.array([0.0, -1.0]))
+    assert e.value.args[0] == "Drive cycle contains negative speeds."
+    with pytest.raises(Exception) as e:
+        drive_cycles.validate_chunk(np.array([1.0, 2.0]), np.array([0.0, np.nan]))
+    assert e.value.args[0] == "Drive cycle contains values that are not finite."
+
+
+def test_compact_drive_cycle_tolerance(csv_file, cycle):
+    chunks = drive_cycles.iter_csv_chunks(csv_file, chunk_size=3000)
+    times, speeds = drive_cycles.compact_drive_cycle(chunks, tolerance=0.01)
+    assert times.size < cycle[0].size / 20
+    assert np.all(np.diff(times) > 0)
+    assert times[0] == cycle[0][0] and times[-1] == cycle[0][-1]
+    errors = np.abs(np.interp(cycle[0], times, speeds) - cycle[1])
+    assert errors.max() <= 0.01
+
+
+def test_compact_drive_cycle_interval(csv_file, cycle):
+    chunks = drive_cycles.iter_csv_chunks(csv_file, chunk_size=777)
+    times, speeds = drive_cycles.compact_drive_cycle(chunks, interval=0.5)
+    np.testing.assert_allclose(np.diff(times), 0.5)
+    assert times.size == 200
+    np.testing.assert_allclose(speeds, np.interp(times, *cycle))
+
+
+def test_post_drive_cycle_file(httpx_mock: HTTPXMock, client, csv_file, tmp_path):
+    httpx_mock.add_response(
+        url=f"{app.os.environ['CONCEPTEV_URL']}/drive_cycles:from_file?design_instance_id=123",
+        method="post",
+        json={"id": "drive_cycle_1"},
+    )
+    cache_file = str(tmp_path / "cache.json")
+    drive_cycle_id = drive_cycles.post_drive_cycle_file(
+        client, csv_file, tolerance=0.01, cache_file=cache_file
+    )
+    assert drive_cycle_id == "drive_cycle_1"
+    assert len(httpx_mock.get_requests()) == 1
+    assert len(httpx_mock.get_requests()[0].read()) < 10_000
+    drive_cycle_id = drive_cycles.post_drive_cycle_file(
+        client, csv_file, tolerance=0.01, cache_file=cache_file
+    )
+    assert drive_cycle_id == "drive_cycle_1"
+    assert len(httpx_mock.get_requests()) == 1
+
+    httpx_mock.add_response(
+        url=f"{app.os.environ['CONCEPTEV_URL']}/drive_cycles:from_file?design_instance_id=456",
+        method="post",
+        json={"id": "drive_cycle_2"},
+    )
+    drive_cycle_id = drive_cycles.post_drive_cycle_file(
+        client,
+        csv_file,
+        tolerance=0.01,
+        cache_file=cache_file,
+        params={"design_instance_id": "456"},
+    )
+    assert drive_cycle_id == "drive_cycle_2"
+    other_client = app.get_http_client("value1", design_instance_id="456")
+    drive_cycle_id = drive_cycles.post_drive_cycle_file(
+        other_client, csv_file, tolerance=0.01, cache_file=cache_file
+    )
+    assert drive_cycle_id == "drive_cycle_2"
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_post_drive_cycle_file_unreadable_cache(httpx_mock: HTTPXMock, client, csv_file, tmp_path):
+    httpx_mock.add_response(
+        url=f"{app.os.environ['CONCEPTEV_URL']}/drive_cycles:from_file?design_instance_id=123",
+        method="post",
+        json={"id": "drive_cycle_1"},
+    )
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text('{"truncated": ')
+    drive_cycle_id = drive_cycles.post_drive_cycle_file(
+        client, csv_file, cache_file=str(cache_file)
+    )
+    assert drive_cycle_id == "drive_cycle_1"
+    assert list(drive_cycles.json.loads(cache_file.read_text()).values()) == ["drive_cycle_1"]
+    assert sorted(path.name for path in tmp_path.iterdir() if "cache" in path.name) == [
+        "cache.json"
+    ]
@@ -0,0 +1,93 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, forces
+
+AERO = {"name": "aero", "drag_coefficient": 0.3, "cross_sectional_area": 2, "config_type": "aero"}
+MASS = {"name": "mass", "mass": 3000, "config_type": "mass"}
+WHEEL = {
+    "name": "wheel",
+    "rolling_radius": 0.3,
+    "rolling_resistance_coefficient": 0.01,
+    "config_type": "wheel",
+}
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def test_calculate_forces_single():
+    results = forces.calculate_forces(AERO, MASS, WHEEL, speeds=[0, 10, 20], grades=[0, 0.1])
+    assert results["total_force"].shape == (1, 2, 3)
+    aero_force = 0.5 * forces.AIR_DENSITY * 0.3 * 2 * 20**2
+    assert results["aero_force"][0, 0, 2] == pytest.approx(aero_force)
+    weight = 3000 * forces.GRAVITY
+    assert results["rolling_resistance_force"][0, 0, 1] == pytest.approx(0.01 * weight)
+    angle = np.arctan(0.1)
+    assert results["grade_force"][0, 1, 0] == pytest.approx(weight * np.sin(angle))
+    total = aero_force + 0.01 * weight * np.cos(angle) + weight * np.sin(angle)
+    assert results["total_force"][0, 1, 2] == pytest.approx(total)
+    assert results["wheel_torque"][0, 1, 2] == pytest.approx(total * 0.3)
+    assert results["wheel_power"][0, 1, 2] == pytest.approx(total * 20)
+
+
+def test_calculate_forces_many_configurations():
+    aeros = [dict(AERO, drag_coefficient=cd) for cd in np.linspace(0.2, 0.4, 1000)]
+    results = forces.calculate_forces(aeros, MASS, WHEEL, speeds=np.linspace(0, 40, 50))
+    assert results["total_force"].shape == (1000, 1, 50)
+    single = forces.calculate_forces(aeros[-1], MASS, WHEEL, speeds=np.linspace(0, 40, 50))
+    np.testing.assert_allclose(results["total_force"][-1], single["total_force"][0])
+
+
+def test_calculate_forces_errors():
+    with pytest.raises(Exception) as e:
+        forces.calculate_forces([AERO, AERO], [MASS] * 3, WHEEL, speeds=[1])
+    assert e.value.args[0].startswith("Aero, mass and wheel")
+    with pytest.raises(Exception) as e:
+        forces.calculate_forces(AERO, {"name": "empty"}, WHEEL, speeds=[1])
+    assert e.value.args[0] == "Configuration empty is missing mass."
+
+
+def test_validate_forces(httpx_mock: HTTPXMock, client):
+    expected = forces.calculate_forces(AERO, MASS, WHEEL, speeds=[15], grades=[0.05])
+    httpx_mock.add_response(
+        url=f"{app.os.environ['CONCEPTEV_URL']}/configurations:calculate_forces"
+        "?design_instance_id=123",
+        method="post",
+        match_json={"aero": AERO, "mass": MASS, "wheel": WHEEL, "speed": 15.0, "grade": 0.05},
+        json={"total_force": float(expected["total_force"][0, 0, 0])},
+    )
+    error = forces.validate_forces(client, AERO, MASS, WHEEL, speeds=[15], grades=[0.05])
+    assert error == pytest.approx(0)
+
+
+def test_validate_forces_mismatch(httpx_mock: HTTPXMock, client):
+    httpx_mock.add_response(method="post", json={"total_force": 1.0})
+    with pytest.raises(Exception) as e:
+        forces.validate_forces(client, AERO, MASS, WHEEL, speeds=[15])
+    assert e.value.args[0].startswith("Local force")
@@ -0,0 +1,166 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, cancellation, journal
+from ansys.conceptev.core.journal import JobJournal
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+CONCEPT = {
+    "requirements_ids": ["abc"],
+    "architecture_id": "def",
+    "id": "ghi",
+    "design_instance_id": "jkl",
+}
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def mock_submit(httpx_mock: HTTPXMock, job_info):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs?design_instance_id=123", json=[{"job": "data"}, {}]
+    )
+    httpx_mock.add_response(url=f"{conceptev_url}/jobs:start?design_instance_id=123", json=job_info)
+
+
+def mock_results(httpx_mock: HTTPXMock, results=None, status_code=200):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123", json=3
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:result?design_instance_id=123&"
+        f"results_file_name=output_file_v3.json&calculate_units=true",
+        method="post",
+        status_code=status_code,
+        json=results,
+    )
+
+
+def test_submit_and_resume(httpx_mock: HTTPXMock, client: httpx.Client, tmp_path):
+    path = str(tmp_path / "journal.db")
+    job_journal = JobJournal(path)
+    mock_submit(httpx_mock, {"job_id": "1"})
+    assert job_journal.submit(client, CONCEPT, "account", "hpc", "job") == {"job_id": "1"}
+    assert job_journal.submit(client, CONCEPT, "account", "hpc", "job") == {"job_id": "1"}
+    assert len(httpx_mock.get_requests()) == 2
+    job_journal.close()
+
+    job_journal = JobJournal(path)
+    [entry] = job_journal.jobs(journal.SUBMITTED)
+    assert entry["job_info"] == {"job_id": "1"}
+    assert entry["inputs_hash"] == journal.inputs_hash(CONCEPT, "account", "hpc")
+    mock_results(httpx_mock, {"results": "returned"})
+    assert job_journal.resume(client, rate_limit=0) == {
+        entry["inputs_hash"]: {"results": "returned"}
+    }
+    assert job_journal.jobs(journal.SUBMITTED) == []
+    assert job_journal.jobs(journal.COMPLETED)[0]["results"] == {"results": "returned"}
+    assert job_journal.read_results(client, entry["inputs_hash"]) == {"results": "returned"}
+    assert job_journal.resume(client) == {}
+
+
+def mock_status(httpx_mock: HTTPXMock, status):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:status?design_instance_id=123", json={"status": status}
+    )
+
+
+def test_unfinished_jobs_are_not_resubmitted(httpx_mock: HTTPXMock, client: httpx.Client):
+    job_journal = JobJournal(":memory:")
+    mock_submit(httpx_mock, {"job_id": "1"})
+    job_journal.submit(client, CONCEPT, "account", "hpc", "job")
+    mock_results(httpx_mock, status_code=202)
+    mock_status(httpx_mock, "running")
+    errors = {}
+    assert job_journal.resume(client, errors=errors, no_of_tries=2, rate_limit=0) == {}
+    [entry] = job_journal.jobs(journal.SUBMITTED)
+    assert str(errors[entry["inputs_hash"]]) == entry["error"]
+    assert entry["error"].startswith("There are too many requests")
+
+    assert job_journal.submit(client, CONCEPT, "account", "hpc", "job") == {"job_id": "1"}
+    paths = [request.url.path.rsplit("/", 1)[-1] for request in httpx_mock.get_requests()]
+    assert paths.count("jobs:start") == 1
+
+
+def test_failed_jobs_are_resubmitted(httpx_mock: HTTPXMock, client: httpx.Client):
+    job_journal = JobJournal(":memory:")
+    mock_submit(httpx_mock, {"job_id": "1"})
+    job_journal.submit(client, CONCEPT, "account", "hpc", "job")
+    mock_results(httpx_mock, status_code=500)
+    mock_status(httpx_mock, "failed")
+    with pytest.raises(Exception) as e:
+        job_journal.resume(client, no_of_tries=1, rate_limit=0)
+    assert e.value.args[0].startswith("Failed to read the results of 1 jobs: ")
+    [entry] = job_journal.jobs(journal.FAILED)
+    assert entry["error"].startswith("There are too many requests")
+
+    mock_submit(httpx_mock, {"job_id": "2"})
+    assert job_journal.submit(client, CONCEPT, "account", "hpc", "job") == {"job_id": "2"}
+    assert job_journal.jobs()[0]["state"] == journal.SUBMITTED
+    with pytest.raises(Exception) as e:
+        job_journal.read_results(client, "unknown")
+    assert e.value.args[0] == "Job unknown is not in the journal."
+
+
+def test_created_jobs_are_started(httpx_mock: HTTPXMock, client: httpx.Client):
+    job_journal = JobJournal(":memory:")
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs?design_instance_id=123", json=[{"job": "data"}, {}]
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:start?design_instance_id=123", status_code=500
+    )
+    with pytest.raises(Exception):
+        job_journal.submit(client, CONCEPT, "account", "hpc", "job")
+    [entry] = job_journal.jobs(journal.CREATED)
+    assert entry["job_info"]["job"] == {"job": "data"}
+
+    httpx_mock.reset(assert_all_responses_were_requested=False)
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:start?design_instance_id=123", json={"job_id": "1"}
+    )
+    assert job_journal.submit(client, CONCEPT, "account", "hpc", "job") == {"job_id": "1"}
+    paths = [request.url.path.rsplit("/", 1)[-1] for request in httpx_mock.get_requests()]
+    assert paths == ["jobs:start"]
+    assert job_journal.jobs(journal.SUBMITTED)[0]["job_info"] == {"job_id": "1"}
+
+
+def test_cancelled_resume(httpx_mock: HTTPXMock, client: httpx.Client):
+    job_journal = JobJournal(":memory:")
+    mock_submit(httpx_mock, {"job_id": "1"})
+    job_journal.submit(client, CONCEPT, "account", "hpc", "job")
+    token = cancellation.CancelToken()
+    token.cancel()
+    with pytest.raises(cancellation.Cancelled) as e:
+        job_journal.resume(client, cancel_token=token, rate_limit=0)
+    assert e.value.progress["results"] == {}
+    [entry] = job_journal.jobs(journal.SUBMITTED)
+    assert entry["error"] is None
@@ -0,0 +1,154 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from ansys.conceptev.core.listener import CompletionListener, default_job_id, parse_events
+
+
+class StandInServer(BaseHTTPRequestHandler):
+    events = True
+    status_requests = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if not self.events:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for job_id, status in (("1", "running"), ("2", "finished"), ("1", "finished")):
+            time.sleep(0.05)
+            event = json.dumps({"job_id": job_id, "status": status})
+            self.wfile.write(f": ping\n\ndata: {event}\n\n".encode())
+            self.wfile.flush()
+        for _ in range(100):
+            time.sleep(0.05)
+            self.wfile.write(b": ping\n\n")
+            self.wfile.flush()
+
+    def do_POST(self):
+        job_info = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        count = self.status_requests.get(job_info["job_id"], 0) + 1
+        self.status_requests[job_info["job_id"]] = count
+        body = json.dumps({"job_id": job_info["job_id"], "status": "running"})
+        if count >= 3:
+            body = json.dumps({"job_id": job_info["job_id"], "status": "finished"})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+
+@pytest.fixture
+def server():
+    StandInServer.status_requests = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInServer)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_events():
+    lines = [": ping", "", "data: {", "data: }", "", "event: x", "data: 1"]
+    assert list(parse_events(lines)) == ["{\n}", "1"]
+
+
+def test_default_job_id():
+    assert default_job_id({"job_id": 1}) == "1"
+    assert default_job_id({"job": {"id": "2"}}) == "2"
+    with pytest.raises(Exception) as e:
+        default_job_id("job info")
+    assert e.value.args[0] == "Cannot find the job ID in job info."
+
+
+def test_events(server):
+    StandInServer.events = True
+    client = httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}")
+    listener = CompletionListener(client)
+    futures = [listener.watch({"job_id": "1"}), listener.watch({"job_id": "2"})]
+    with listener:
+        assert futures[0].result(timeout=5) == {"job_id": "1", "status": "finished"}
+        assert futures[1].result(timeout=5)["status"] == "finished"
+        assert listener.mode == "events"
+    assert all(count == 1 for count in StandInServer.status_requests.values())
+
+
+def test_polling_fallback(server):
+    StandInServer.events = False
+    client = httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}")
+    with CompletionListener(client, min_interval=0.01, max_interval=0.05) as listener:
+        future = listener.watch({"job_id": "3"})
+        assert future.result(timeout=5) == {"job_id": "3", "status": "finished"}
+        assert listener.mode == "polling"
+    assert StandInServer.status_requests["3"] >= 3
+
+
+def test_finished_before_watch(server):
+    StandInServer.events = True
+    StandInServer.status_requests = {"4": 2}
+    client = httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}")
+    listener = CompletionListener(client)
+    listener._update("7", {"job_id": "7", "status": "finished"})
+    assert listener.watch({"job_id": "7"}).result(timeout=0) == {
+        "job_id": "7",
+        "status": "finished",
+    }
+    with listener:
+        future = listener.watch({"job_id": "4"})
+        assert future.result(timeout=5) == {"job_id": "4", "status": "finished"}
+    assert "7" not in StandInServer.status_requests
+
+
+def test_bounded_state():
+    listener = CompletionListener(httpx.Client(), max_finished=3)
+    for index in range(10):
+        listener._update(str(index), {"job_id": str(index), "status": "running"})
+        listener._update(str(index), {"job_id": str(index), "status": "finished"})
+    assert len(listener._finished) == 3
+    assert listener._statuses == {}
+    assert listener.watch({"job_id": "9"}).result(timeout=0)["status"] == "finished"
+
+
+def test_watch_many(server):
+    StandInServer.events = False
+    StandInServer.status_requests = {str(index): 2 for index in range(50)}
+    client = httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}")
+    listener = CompletionListener(client, check_workers=2)
+    futures = [listener.watch({"job_id": str(index)}) for index in range(50)]
+    assert all(future.result(timeout=5)["status"] == "finished" for future in futures)
+    names = [thread.name for thread in threading.enumerate()]
+    assert len([name for name in names if name.startswith("job-status-check")]) <= 2
@@ -0,0 +1,166 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import threading
+
+import httpx
+import numpy as np
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, loss_map
+from ansys.conceptev.core.cache import DiskCache, LRUCache
+from ansys.conceptev.core.loss_map import LossMap
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+@pytest.fixture
+def display_data():
+    currents = np.linspace(0, 400, 9)
+    phase_advances = np.linspace(0, 90, 7)
+    x, y = np.meshgrid(currents, phase_advances)
+    return {
+        "currents": currents.tolist(),
+        "phase_advances": phase_advances.tolist(),
+        "losses_total": (100 + 2 * x + 3 * y + 0.01 * x * y).tolist(),
+    }
+
+
+def test_from_display_data(display_data):
+    loss_map = LossMap.from_display_data(display_data)
+    assert loss_map.losses.shape == (7, 9)
+    transposed = LossMap(
+        display_data["currents"],
+        display_data["phase_advances"],
+        np.array(display_data["losses_total"]).T,
+    )
+    np.testing.assert_array_equal(transposed.losses, loss_map.losses)
+    with pytest.raises(Exception) as e:
+        LossMap([1, 2, 3], [1, 2], [[1, 2], [3, 4]])
+    assert e.value.args[0].startswith("Loss map shape")
+
+
+def test_losses_at_unsorted_axes(display_data):
+    loss_map = LossMap(
+        display_data["currents"][::-1],
+        display_data["phase_advances"],
+        np.array(display_data["losses_total"])[:, ::-1],
+    )
+    assert loss_map.losses_at(400, 90) == pytest.approx(100 + 800 + 270 + 360)
+
+
+@pytest.mark.parametrize("method", ["linear", "cubic"])
+def test_losses_at(display_data, method):
+    loss_map = LossMap.from_display_data(display_data)
+    rng = np.random.default_rng(0)
+    currents = rng.uniform(0, 400, 10_000)
+    phase_advances = rng.uniform(0, 90, 10_000)
+    losses = loss_map.losses_at(currents, phase_advances, method=method)
+    expected = 100 + 2 * currents + 3 * phase_advances + 0.01 * currents * phase_advances
+    np.testing.assert_allclose(losses, expected)
+
+
+def test_cubic_losses_at_quadratic():
+    currents = np.linspace(0, 10, 6)
+    phase_advances = np.linspace(0, 5, 4)
+    x, y = np.meshgrid(currents, phase_advances)
+    loss_map = LossMap(currents, phase_advances, x**2 + y)
+    points = np.array([0.5, 3.3, 9.9])
+    linear = loss_map.losses_at(points, 1.0)
+    cubic = loss_map.losses_at(points, 1.0, method="cubic")
+    np.testing.assert_allclose(cubic, points**2 + 1)
+    assert np.all(np.abs(linear - (points**2 + 1)) > 1e-3)
+
+
+def test_losses_at_outside(display_data):
+    loss_map = LossMap.from_display_data(display_data)
+    losses = loss_map.losses_at([-1, 500, 100], [10, 10, 100])
+    assert np.all(np.isnan(losses))
+    assert loss_map.losses_at(-1, 10, fill_value=0) == 0
+    with pytest.raises(Exception) as e:
+        loss_map.losses_at(1, 1, method="nearest")
+    assert e.value.args[0] == "Unknown interpolation method nearest."
+
+
+def test_efficiency_at(display_data):
+    loss_map = LossMap.from_display_data(display_data)
+    losses = loss_map.losses_at(200, 45)
+    efficiency = loss_map.efficiency_at(200, 45, [10_000, -10_000, 0])
+    np.testing.assert_allclose(
+        efficiency, [10_000 / (10_000 + losses), (10_000 - losses) / 10_000, 0]
+    )
+
+
+@pytest.fixture
+def client():
+    loss_map._format_versions.clear()
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def test_get_loss_map_cached(httpx_mock: HTTPXMock, client: httpx.Client, display_data, tmp_path):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123", json="7"
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components:get_display_data?component_id=m1&design_instance_id=123",
+        method="post",
+        json=display_data,
+    )
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    motor = {"id": "m1", "name": "e9", "component_type": "MotorLabID", "data_id": "d1"}
+    result = loss_map.get_loss_map(client, motor, cache)
+    assert result.losses.shape == (7, 9)
+    cache.close()
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    renamed = {**motor, "id": "m2", "name": "copy"}
+    assert loss_map.get_display_data(client, renamed, cache) == display_data
+    assert len(cache) == 1
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_prefetch(httpx_mock: HTTPXMock, client: httpx.Client, display_data):
+    release = threading.Event()
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123", json="7"
+    )
+    motor = {"id": "m1", "component_type": "MotorLabID", "data_id": "d1"}
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components?design_instance_id=123", method="post", json=motor
+    )
+
+    def display(request: httpx.Request):
+        release.wait(5)
+        return httpx.Response(status_code=200, json=display_data)
+
+    httpx_mock.add_callback(display, method="post")
+    cache = LRUCache()
+    created = loss_map.create_component(client, {"component_type": "MotorLabID"}, cache)
+    assert created == motor
+    waiting = threading.Thread(target=loss_map.get_display_data, args=(client, motor, cache))
+    waiting.start()
+    release.set()
+    waiting.join(5)
+    assert loss_map.get_display_data(client, motor, cache) == display_data
+    paths = [request.url.path.rsplit("/", 1)[-1] for request in httpx_mock.get_requests()]
+    assert paths.count("components:get_display_data") == 1
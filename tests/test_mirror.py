@@ -0,0 +1,161 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.hashing import canonical_hash, canonical_json
+from ansys.conceptev.core.mirror import DesignInstanceMirror
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def test_canonical_hash():
+    assert canonical_json({"b": 1, "a": [1, 2]}) == b'{"a":[1,2],"b":1}'
+    assert canonical_hash({"b": 1, "a": 2}) == canonical_hash({"a": 2, "b": 1})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+
+def test_sync(httpx_mock: HTTPXMock, client: httpx.Client, tmp_path):
+    path = str(tmp_path / "mirror.db")
+    configurations = [{"id": "1", "name": "Aero"}, {"id": "2", "name": "Mass"}]
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="get",
+        json=configurations,
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components?design_instance_id=123", method="get", json=[]
+    )
+    mirror = DesignInstanceMirror(client, path, routers=("/configurations", "/components"))
+    changes = mirror.sync()
+    assert changes["/configurations"] == {"added": 2, "updated": 0, "removed": 0}
+    assert mirror.get("/configurations", "2")["name"] == "Mass"
+    mirror.close()
+
+    httpx_mock.reset(assert_all_responses_were_requested=False)
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="get",
+        match_headers={"If-None-Match": '"v1"'},
+        status_code=304,
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components?design_instance_id=123",
+        method="get",
+        json=[{"id": "3", "name": "Motor"}],
+    )
+    mirror = DesignInstanceMirror(client, path, routers=("/configurations", "/components"))
+    assert len(mirror.list("/configurations")) == 2
+    changes = mirror.sync()
+    assert changes["/configurations"] == {"added": 0, "updated": 0, "removed": 0}
+    assert changes["/components"] == {"added": 1, "updated": 0, "removed": 0}
+
+    httpx_mock.reset(assert_all_responses_were_requested=False)
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="get",
+        json=[{"id": "1", "name": "Aero"}, {"id": "2", "name": "Heavy"}],
+        headers={"ETag": '"v2"'},
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components?design_instance_id=123", method="get", json=[]
+    )
+    changes = mirror.sync()
+    assert changes["/configurations"] == {"added": 0, "updated": 1, "removed": 0}
+    assert changes["/components"] == {"added": 0, "updated": 0, "removed": 1}
+    assert mirror.get("/configurations", "2")["name"] == "Heavy"
+    with pytest.raises(Exception) as e:
+        mirror.get("/components", "3")
+    assert e.value.args[0] == "ID 3 from /components is not in the mirror."
+
+
+def test_write_through(httpx_mock: HTTPXMock, client: httpx.Client):
+    mirror = DesignInstanceMirror(client)
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations?design_instance_id=123",
+        method="post",
+        json={"id": "1", "name": "Aero"},
+    )
+    mirror.post("/configurations", {"name": "Aero"})
+    assert mirror.get("/configurations", "1")["name"] == "Aero"
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations/1?design_instance_id=123",
+        method="put",
+        json={"id": "1", "name": "Aero 2"},
+    )
+    mirror.put("/configurations", "1", {"name": "Aero 2"})
+    assert mirror.get("/configurations", "1")["name"] == "Aero 2"
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/configurations/1?design_instance_id=123",
+        method="delete",
+        status_code=204,
+    )
+    mirror.delete("/configurations", "1")
+    assert mirror.list("/configurations") == []
+
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components/5?design_instance_id=123",
+        method="get",
+        status_code=404,
+    )
+    assert mirror.refresh("/components", "5") is None
+
+
+def test_scoped_mirror(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=456",
+        method="get",
+        json=[{"id": "1", "name": "Scoped"}],
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts/1?design_instance_id=456",
+        method="get",
+        json={"id": "1", "name": "Refreshed"},
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts?design_instance_id=456",
+        method="post",
+        json={"id": "2", "name": "Created"},
+    )
+    with client.design_instance("456"):
+        mirror = DesignInstanceMirror(client, routers=("/concepts",))
+    assert mirror.design_instance_id == "456"
+    assert mirror.sync()["/concepts"]["added"] == 1
+    assert mirror.refresh("/concepts", "1")["name"] == "Refreshed"
+    mirror.post("/concepts", {"name": "Created"})
+    assert sorted(entity["name"] for entity in mirror.list("/concepts")) == [
+        "Created",
+        "Refreshed",
+    ]
@@ -0,0 +1,153 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib
+import os
+import sys
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, codec
+from ansys.conceptev.core import models as installed_models
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+CONCEPT = {
+    "id": "concept_1",
+    "name": "Branch 1",
+    "design_instance_id": "123",
+    "components_ids": ["motor_1"],
+    "created_at": "2024-01-01",
+}
+
+BATTERY = {
+    "id": "battery_1",
+    "capacity": 86400000,
+    "charge_acceptance_limit": 0,
+    "component_type": "BatteryFixedVoltages",
+    "internal_resistance": 0.1,
+    "name": "New Battery",
+    "voltage_max": 400,
+    "voltage_mid": 350,
+    "voltage_min": 300,
+}
+
+
+@pytest.fixture(params=["msgspec", "dataclasses"])
+def models(request, monkeypatch):
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+    else:
+        monkeypatch.setitem(sys.modules, "msgspec", None)
+    yield importlib.reload(installed_models)
+    monkeypatch.undo()
+    importlib.reload(installed_models)
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def deep_size(value) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key) + deep_size(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(deep_size(item) for item in value)
+    elif not isinstance(value, (str, bytes, int, float, bool, type(None))):
+        names = getattr(type(value), "__struct_fields__", None) or type(value).__slots__
+        size += sum(deep_size(getattr(value, name)) for name in names)
+    return size
+
+
+def test_from_dict(models):
+    concept = models.from_dict(models.Concept, CONCEPT)
+    assert concept.id == "concept_1"
+    assert concept.components_ids == ["motor_1"]
+    assert concept.requirements_ids == []
+    assert concept.extra == {"created_at": "2024-01-01"}
+    assert models.to_dict(concept)["created_at"] == "2024-01-01"
+    assert not hasattr(concept, "__dict__")
+    assert models.from_dict(models.Concept, CONCEPT, keep_extra=False).extra is None
+
+
+def test_memory(models):
+    batteries = [dict(BATTERY, id=f"battery_{index}") for index in range(100)]
+    decoded = models.decode(codec.dumps(batteries), models.Component)
+    assert decoded[0].voltage_mid == 350
+    assert decoded[0].extra is None
+    assert deep_size(decoded) < 0.7 * deep_size(codec.loads(codec.dumps(batteries)))
+
+
+def test_from_dict_invalid(models):
+    with pytest.raises(Exception) as e:
+        models.from_dict(models.Concept, {"id": "1", "name": 2})
+    assert e.value.args[0].startswith("Invalid Concept: ")
+    assert "name" in e.value.args[0]
+    with pytest.raises(Exception) as e:
+        models.from_dict(models.Component, {"id": "1", "name": True})
+    assert e.value.args[0].startswith("Invalid Component: ")
+    with pytest.raises(Exception) as e:
+        models.from_dict(models.Concept, {"id": "1"})
+    assert e.value.args[0].startswith("Invalid Concept: ")
+    with pytest.raises(Exception) as e:
+        models.from_dict(models.Job, [])
+    assert e.value.args[0] == "Invalid Job: expected an object, got []."
+
+
+def test_decode(models):
+    content = codec.dumps([CONCEPT, dict(CONCEPT, id="concept_2")])
+    concepts = models.decode(content, models.Concept)
+    assert [concept.id for concept in concepts] == ["concept_1", "concept_2"]
+    assert concepts[0].extra is None
+    assert models.decode(content, models.Concept, keep_extra=True)[0].extra == {
+        "created_at": "2024-01-01"
+    }
+    result = models.decode(b' {"capability_curve": {"speeds": [1]}}', models.JobResult)
+    assert result.capability_curve == {"speeds": [1]}
+    with pytest.raises(Exception) as e:
+        models.decode(b"{}", models.JobResult, many=True)
+    assert e.value.args[0] == "Invalid JobResult list: expected a list."
+    with pytest.raises(Exception) as e:
+        models.decode(b'[{"id": 1, "name": "a"}]', models.Concept)
+    assert e.value.args[0].startswith("Invalid Concept: ")
+
+
+def test_get(httpx_mock: HTTPXMock, client: httpx.Client, models):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components/1?design_instance_id=123",
+        method="get",
+        json={"id": "1", "name": "e9", "component_type": "MotorLabID", "data_id": "d", "x": 1},
+    )
+    component = models.get(client, "/components", models.Component, id="1")
+    assert component == models.Component(
+        id="1", name="e9", component_type="MotorLabID", data_id="d"
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components/2?design_instance_id=123", method="get", status_code=404
+    )
+    with pytest.raises(Exception) as e:
+        models.get(client, "/components", models.Component, id="2")
+    assert e.value.args[0].startswith("Response Failed:")
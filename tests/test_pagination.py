@@ -0,0 +1,122 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.pagination import aiter_collection, iter_collection
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+CONCEPTS = [{"id": str(index), "name": f"concept {index}"} for index in range(5)]
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def paginate(request: httpx.Request):
+    skip = int(request.url.params["skip"])
+    limit = int(request.url.params["limit"])
+    return httpx.Response(status_code=200, json=CONCEPTS[skip : skip + limit])
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_collection(httpx_mock: HTTPXMock, client: httpx.Client, prefetch):
+    httpx_mock.add_callback(paginate, method="get")
+    concepts = list(iter_collection(client, "/concepts", page_size=2, prefetch=prefetch))
+    assert concepts == CONCEPTS
+    assert [request.url.params["skip"] for request in httpx_mock.get_requests()] == [
+        "0",
+        "2",
+        "4",
+    ]
+    assert all(
+        request.url.params["design_instance_id"] == "123" for request in httpx_mock.get_requests()
+    )
+
+
+def test_iter_collection_exact_pages(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(paginate, method="get")
+    concepts = iter_collection(client, "/concepts", page_size=5, params={"populated": True})
+    assert list(concepts) == CONCEPTS
+    assert len(httpx_mock.get_requests()) == 2
+    assert httpx_mock.get_requests()[0].url.params["populated"] == "true"
+
+
+def test_iter_collection_without_paging(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_response(method="get", json=CONCEPTS)
+    assert list(iter_collection(client, "/concepts", page_size=2)) == CONCEPTS
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_collection_ignored_offset(httpx_mock: HTTPXMock, client: httpx.Client, prefetch):
+    httpx_mock.add_response(method="get", json=CONCEPTS[:2])
+    concepts = list(iter_collection(client, "/concepts", page_size=2, prefetch=prefetch))
+    assert concepts == CONCEPTS[:2]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_iter_collection_in_scope(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(paginate, method="get")
+    with client.design_instance("scoped"):
+        assert list(iter_collection(client, "/concepts", page_size=2)) == CONCEPTS
+    assert all(
+        request.url.params["design_instance_id"] == "scoped"
+        for request in httpx_mock.get_requests()
+    )
+
+
+def test_iter_collection_early_stop(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(paginate, method="get")
+    concepts = iter_collection(client, "/concepts", page_size=2, prefetch=False)
+    assert next(concepts) == CONCEPTS[0]
+    concepts.close()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_aiter_collection(httpx_mock: HTTPXMock):
+    httpx_mock.add_callback(paginate, method="get")
+
+    async def main():
+        async with httpx.AsyncClient(base_url=conceptev_url) as client:
+            return [concept async for concept in aiter_collection(client, "/concepts", 2)]
+
+    assert asyncio.run(main()) == CONCEPTS
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_aiter_collection_ignored_offset(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(method="get", json=CONCEPTS[:2])
+
+    async def main():
+        async with httpx.AsyncClient(base_url=conceptev_url) as client:
+            return [concept async for concept in aiter_collection(client, "/concepts", 2)]
+
+    assert asyncio.run(main()) == CONCEPTS[:2]
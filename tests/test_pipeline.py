@@ -0,0 +1,103 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, codec
+from ansys.conceptev.core.pipeline import ResultsPipeline
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+def max_torque(results):
+    return max(results[0]["capability_curve"]["torques"])
+
+
+def add(total, value):
+    return total + value
+
+
+def download(client, job_info):
+    torques = [job_info["job"] * value for value in range(100)]
+    return codec.dumps([{"capability_curve": {"torques": torques}}])
+
+
+def fail(client, job_info):
+    raise Exception("Download failed")
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def test_run(client: httpx.Client):
+    job_infos = [{"job": index} for index in range(20)]
+    pipeline = ResultsPipeline(max_torque, max_workers=2, download_workers=2, max_pending=3)
+    assert pipeline.run(client, job_infos, download=download) == [99 * index for index in range(20)]
+
+
+def test_run_in_design_instance_scope(client: httpx.Client):
+    def scoped_download(client, job_info):
+        assert app.get_design_instance_id(client) == "scoped"
+        return download(client, job_info)
+
+    with client.design_instance("scoped"):
+        outputs = ResultsPipeline(max_torque, max_workers=1).run(
+            client, [{"job": 1}, {"job": 2}], download=scoped_download
+        )
+    assert outputs == [99, 198]
+
+
+def test_run_reduce(client: httpx.Client):
+    job_infos = [{"job": index} for index in range(10)]
+    pipeline = ResultsPipeline(max_torque, reduce=add, initial=0, max_workers=2)
+    assert pipeline.run(client, job_infos, download=download) == 99 * 45
+
+
+def test_run_download_error(client: httpx.Client):
+    with pytest.raises(Exception) as e:
+        ResultsPipeline(max_torque, max_workers=1).run(client, [{"job": 1}], download=fail)
+    assert e.value.args[0] == "Download failed"
+
+
+def test_run_read_results(httpx_mock: HTTPXMock, client: httpx.Client):
+    example_results = [{"capability_curve": {"torques": [1, 5, 2]}}]
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/utilities:data_format_version?design_instance_id=123",
+        method="get",
+        json=3,
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/jobs:result?design_instance_id=123&"
+        f"results_file_name=output_file_v3.json&calculate_units=false",
+        method="post",
+        match_json={"job": "mocked_job"},
+        json=example_results,
+    )
+    pipeline = ResultsPipeline(max_workers=1)
+    results = pipeline.run(client, [{"job": "mocked_job"}], calculate_units=False)
+    assert results == [example_results]
@@ -0,0 +1,83 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, codec
+from ansys.conceptev.core.cache import LRUCache
+from ansys.conceptev.core.requirements import calculate_examples, calculate_examples_batch
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def examples(request: httpx.Request):
+    requirement = codec.loads(request.content)
+    return httpx.Response(status_code=200, json={"speed": requirement["speed"] * 2})
+
+
+def test_calculate_examples(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(
+        examples,
+        url=f"{conceptev_url}/requirements:calculate_examples?design_instance_id=123",
+        method="post",
+    )
+    cache = LRUCache()
+    assert calculate_examples(client, {"speed": 10, "name": "a"}, cache) == {"speed": 20}
+    assert calculate_examples(client, {"name": "a", "speed": 10.0}, cache) == {"speed": 20}
+    assert len(httpx_mock.get_requests()) == 1
+    assert calculate_examples(client, {"speed": 10, "name": "a"}, None) == {"speed": 20}
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_calculate_examples_batch(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(examples, method="post")
+    requirements = [{"speed": index % 5} for index in range(100)]
+    cache = LRUCache()
+    results = calculate_examples_batch(client, requirements, cache=cache)
+    assert results == [{"speed": 2 * (index % 5)} for index in range(100)]
+    assert len(httpx_mock.get_requests()) == 5
+    calculate_examples_batch(client, requirements + [{"speed": 7}], cache=cache)
+    assert len(httpx_mock.get_requests()) == 6
+
+
+def test_calculate_examples_batch_in_scope(httpx_mock: HTTPXMock, client: httpx.Client):
+    httpx_mock.add_callback(
+        examples,
+        url=f"{conceptev_url}/requirements:calculate_examples?design_instance_id=scoped",
+        method="post",
+    )
+    cache = LRUCache()
+    with client.design_instance("scoped"):
+        assert calculate_examples_batch(client, [{"speed": 1}, {"speed": 2}], cache=cache) == [
+            {"speed": 2},
+            {"speed": 4},
+        ]
+    assert all(key[1] == "scoped" for key in cache._items)
@@ -0,0 +1,143 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import time
+
+import pytest
+
+from ansys.conceptev.core import app, cancellation
+from ansys.conceptev.core.cancellation import Cancelled, CancelToken
+from ansys.conceptev.core.scheduler import JobScheduler, Target
+
+
+class FakeCluster:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+        self.order = []
+
+    def submit(self, client, concept, account_id, hpc_id):
+        with self.lock:
+            self.order.append(concept["id"])
+            self.running[hpc_id] = self.running.get(hpc_id, 0) + 1
+            self.peak[hpc_id] = max(self.peak.get(hpc_id, 0), self.running[hpc_id])
+        if concept.get("fail"):
+            raise Exception(f"Failed to submit {concept['id']}")
+        return {"concept": concept["id"], "hpc_id": hpc_id}
+
+    def wait(self, client, job_info):
+        time.sleep(0.01)
+        with self.lock:
+            self.running[job_info["hpc_id"]] -= 1
+        return job_info
+
+
+def test_run():
+    cluster = FakeCluster()
+    targets = [Target("account_1", "hpc_1", 2), Target("account_2", "hpc_2", 1)]
+    scheduler = JobScheduler(None, targets, submit=cluster.submit, wait=cluster.wait)
+    futures = [scheduler.add({"id": str(index)}) for index in range(12)]
+    scheduler.run()
+    assert [future.result()["concept"] for future in futures] == [str(i) for i in range(12)]
+    assert cluster.peak == {"hpc_1": 2, "hpc_2": 1}
+    hpcs = [future.result()["hpc_id"] for future in futures]
+    assert hpcs.count("hpc_1") > hpcs.count("hpc_2") > 0
+
+
+def test_run_shared_hpc():
+    cluster = FakeCluster()
+    targets = [Target("account_1", "hpc", 2), Target("account_2", "hpc", 2)]
+    scheduler = JobScheduler(None, targets, submit=cluster.submit, wait=cluster.wait)
+    futures = [scheduler.add({"id": str(index)}) for index in range(8)]
+    scheduler.run()
+    assert all(future.done() for future in futures)
+    assert cluster.peak == {"hpc": 2}
+
+    cluster = FakeCluster()
+    scheduler = JobScheduler(
+        None, targets, submit=cluster.submit, wait=cluster.wait, hpc_limits={"hpc": 3}
+    )
+    futures = [scheduler.add({"id": str(index)}) for index in range(12)]
+    scheduler.run()
+    assert cluster.peak == {"hpc": 3}
+    assert scheduler.hpc_running == {"hpc": 0}
+
+
+def test_run_priorities_and_errors():
+    cluster = FakeCluster()
+    scheduler = JobScheduler(
+        None, [Target("account", "hpc", 1)], submit=cluster.submit, wait=cluster.wait
+    )
+    low = scheduler.add({"id": "low"})
+    failing = scheduler.add({"id": "failing", "fail": True}, priority=5)
+    high = scheduler.add({"id": "high"}, priority=10)
+    cancelled = scheduler.add({"id": "cancelled"})
+    cancelled.cancel()
+    scheduler.run()
+    assert cluster.order == ["high", "failing", "low"]
+    assert high.result()["concept"] == "high"
+    assert low.done()
+    with pytest.raises(Exception) as e:
+        failing.result()
+    assert e.value.args[0] == "Failed to submit failing"
+
+
+def test_run_in_design_instance_scope():
+    client = app.get_http_client("value1", design_instance_id="123")
+
+    def submit(client, concept, account_id, hpc_id):
+        return app.get_design_instance_id(client)
+
+    scheduler = JobScheduler(client, [Target("a", "h")], submit=submit, wait=lambda c, j: j)
+    future = scheduler.add({"id": "1"})
+    with client.design_instance("scoped"):
+        scheduler.run()
+    assert future.result() == "scoped"
+
+
+def test_run_cancelled():
+    token = CancelToken()
+    started = threading.Event()
+
+    def submit(client, concept, account_id, hpc_id):
+        return concept
+
+    def wait(client, job_info):
+        started.set()
+        cancellation.sleep(10)
+
+    scheduler = JobScheduler(None, [Target("a", "h", 1)], submit=submit, wait=wait)
+    futures = [scheduler.add({"id": str(index)}) for index in range(3)]
+    threading.Thread(target=lambda: started.wait(5) and token.cancel()).start()
+    start = time.monotonic()
+    scheduler.run(cancel_token=token)
+    assert time.monotonic() - start < 5
+    assert all(isinstance(future.exception(), Cancelled) for future in futures)
+    assert scheduler.running == [0]
+
+
+def test_no_targets():
+    with pytest.raises(Exception) as e:
+        JobScheduler(None, [])
+    assert e.value.args[0] == "The scheduler needs at least one target."
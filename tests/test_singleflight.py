@@ -0,0 +1,134 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app, singleflight
+from ansys.conceptev.core.singleflight import SingleFlight
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+def test_do():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        release.wait()
+        return {"value": value}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(group.do, "key", slow, 1) for _ in range(5)]
+        while group.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert group.in_flight() == 0
+    assert group.do("key", slow, 2) == {"value": 2}
+
+
+def test_do_error():
+    group = SingleFlight()
+
+    def fail():
+        raise Exception("Failed")
+
+    with pytest.raises(Exception) as e:
+        group.do("key", fail)
+    assert e.value.args[0] == "Failed"
+    assert group.in_flight() == 0
+
+
+def test_do_async():
+    group = SingleFlight()
+    calls = []
+
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    async def main():
+        waiter = asyncio.ensure_future(group.do_async("key", slow, 1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await asyncio.gather(*[group.do_async("key", slow, 1) for _ in range(5)])
+
+    assert asyncio.run(main()) == [1] * 5
+    assert calls == [1]
+    assert group.in_flight() == 0
+
+
+def test_get(httpx_mock: HTTPXMock, client: httpx.Client):
+    def slow_response(request: httpx.Request):
+        time.sleep(0.2)
+        return httpx.Response(status_code=200, json={"id": "1"})
+
+    httpx_mock.add_callback(
+        slow_response, url=f"{conceptev_url}/concepts/1?design_instance_id=123", method="get"
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda _: singleflight.get(client, "/concepts", id="1"), range(4))
+        )
+    assert results == [{"id": "1"}] * 4
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_post_async(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components:calculate_loss_map?component_id=1",
+        method="post",
+        match_json={},
+        json={"losses": [1, 2]},
+    )
+
+    async def main():
+        async with httpx.AsyncClient(base_url=conceptev_url) as client:
+            calls = [
+                singleflight.post_async(
+                    client, "/components:calculate_loss_map", {}, {"component_id": "1"}
+                )
+                for _ in range(3)
+            ]
+            return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == [{"losses": [1, 2]}] * 3
+    assert len(httpx_mock.get_requests()) == 1
@@ -0,0 +1,114 @@
+# Copyright (C) 2023 - 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ansys.conceptev.core import app
+from ansys.conceptev.core.snapshot import ConceptSnapshot
+
+conceptev_url = os.environ["CONCEPTEV_URL"]
+
+
+@pytest.fixture
+def client():
+    return app.get_http_client("value1", design_instance_id="123")
+
+
+@pytest.fixture
+def concept():
+    return {
+        "id": "concept_1",
+        "name": "Branch 1",
+        "architecture_id": "arch_1",
+        "architecture": {"id": "arch_1", "front_motor_id": "motor_1", "battery_id": "battery_1"},
+        "components_ids": ["motor_1", "battery_1"],
+        "components": [{"id": "motor_1", "name": "e9"}],
+        "configurations_ids": ["aero_1", "mass_1"],
+        "requirements_ids": [],
+        "drive_cycles_ids": [],
+    }
+
+
+def mock_get(httpx_mock: HTTPXMock, path: str, json):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}{path}?design_instance_id=123", method="get", json=json
+    )
+
+
+def test_load(httpx_mock: HTTPXMock, client: httpx.Client, concept):
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts/concept_1?design_instance_id=123&populated=true",
+        method="get",
+        json=concept,
+    )
+    mock_get(httpx_mock, "/components/battery_1", {"id": "battery_1", "name": "Battery"})
+    mock_get(httpx_mock, "/configurations/aero_1", {"id": "aero_1", "name": "Aero"})
+    mock_get(httpx_mock, "/configurations/mass_1", {"id": "mass_1", "name": "Mass"})
+
+    snapshot = ConceptSnapshot.load(client, "concept_1")
+    assert len(snapshot) == 5
+    assert len(httpx_mock.get_requests()) == 4
+    assert snapshot.get("aero_1")["name"] == "Aero"
+    assert snapshot.find("/components", "e9")["id"] == "motor_1"
+    assert [entity["id"] for entity in snapshot.all("/configurations")] == ["aero_1", "mass_1"]
+    assert "arch_1" in snapshot
+
+    architecture = snapshot.resolve(concept, "architecture_id")
+    assert snapshot.resolve(architecture, "front_motor_id")["name"] == "e9"
+    assert [c["id"] for c in snapshot.resolve(concept, "components_ids")] == [
+        "motor_1",
+        "battery_1",
+    ]
+    assert snapshot.resolve(concept, "requirements_ids") == []
+
+
+def test_load_in_design_instance_scope(httpx_mock: HTTPXMock, client: httpx.Client, concept):
+    concept["configurations_ids"] = []
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/concepts/concept_1?design_instance_id=scoped&populated=true",
+        json=concept,
+    )
+    httpx_mock.add_response(
+        url=f"{conceptev_url}/components/battery_1?design_instance_id=scoped",
+        json={"id": "battery_1", "name": "Battery"},
+    )
+    with client.design_instance("scoped"):
+        snapshot = ConceptSnapshot.load(client, "concept_1")
+    assert snapshot.get("battery_1")["name"] == "Battery"
+
+
+def test_resolve_fetches_missing(httpx_mock: HTTPXMock, client: httpx.Client):
+    snapshot = ConceptSnapshot({"id": "concept_1"}, client)
+    architecture = {"id": "arch_1", "rear_motor_id": "motor_2"}
+    with pytest.raises(Exception) as e:
+        snapshot.resolve(architecture, "rear_motor_id")
+    assert e.value.args[0] == "ID motor_2 is not in the concept snapshot."
+    mock_get(httpx_mock, "/components/motor_2", {"id": "motor_2", "name": "Rear"})
+    assert snapshot.resolve(architecture, "rear_motor_id", "/components")["name"] == "Rear"
+    assert snapshot.resolve(architecture, "rear_motor_id")["name"] == "Rear"
+    with pytest.raises(Exception) as e:
+        snapshot.find("/components", "Front")
+    assert e.value.args[0] == "No entity named Front from /components in the concept snapshot."